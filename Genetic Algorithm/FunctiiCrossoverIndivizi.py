@@ -0,0 +1,592 @@
+import numpy as np
+
+
+# ------------ Binary or integer representation ------------
+
+
+# one-point crossover
+def single_point_crossover(parent_1, parent_2):
+    size = len(parent_1)
+
+    # randomly generates the crossover point
+    rand_point = np.random.randint(1, size)
+
+    child_1 = list(parent_1)
+    child_2 = list(parent_2)
+
+    # selecting the sequences that create the first child
+    child_1[rand_point:size] = parent_2[rand_point:size]
+
+    # selecting the sequences that create the second child
+    child_2[rand_point:size] = parent_1[rand_point:size]
+
+    return child_1, child_2
+
+
+# Uniform Crossover
+def uniform_crossover(parent_1, parent_2):
+    size = len(parent_1)
+    parent_1 = np.asarray(parent_1)
+    parent_2 = np.asarray(parent_2)
+
+    # for every gene decide which parent gives it to the first child - a single call for all genes
+    r = np.random.randint(0, 2, size)
+
+    # child construction
+    child_1 = np.where(r == 0, parent_1, parent_2)
+    child_2 = np.where(r == 0, parent_2, parent_1)
+
+    return child_1.tolist(), child_2.tolist()
+
+
+# The following operators work on a whole population at once
+# population - ndarray (pop_size, n), the 0/1 (or integer) individuals
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# they return the children matrix (2k, n): lines 2i and 2i + 1 are the two children of (pairs[i, 0], pairs[i, 1])
+# out - optional ndarray (2k, n) in which the children are written (ex. the buffer of the next generation)
+
+# one-point crossover on a population
+def single_point_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    size = population.shape[1]
+
+    # the crossover points of all the pairs in a single call
+    rand_point = np.random.randint(1, size, len(pairs))
+
+    # the genes from rand_point onwards are exchanged
+    exchanged = np.arange(size) >= rand_point[:, None]
+
+    return __exchange_genes__(population[pairs[:, 0]], population[pairs[:, 1]], exchanged, out)
+
+
+# two-point crossover on a population
+def two_point_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    size = population.shape[1]
+
+    # both crossover points of all the pairs in a single call
+    # if the two points are equal no gene is exchanged
+    rand_points = np.sort(np.random.randint(1, size, (len(pairs), 2)), axis=1)
+
+    # the genes between the two points are exchanged
+    genes = np.arange(size)
+    exchanged = (genes >= rand_points[:, 0:1]) & (genes < rand_points[:, 1:2])
+
+    return __exchange_genes__(population[pairs[:, 0]], population[pairs[:, 1]], exchanged, out)
+
+
+# uniform crossover on a population
+def uniform_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    size = population.shape[1]
+
+    # the mask of all the pairs in a single call
+    exchanged = np.random.randint(0, 2, (len(pairs), size)).astype(bool)
+
+    return __exchange_genes__(population[pairs[:, 0]], population[pairs[:, 1]], exchanged, out)
+
+
+# build the children of the lines of parents_1 and parents_2, exchanging the genes marked in exchanged
+def __exchange_genes__(parents_1, parents_2, exchanged, out):
+    if out is None:
+        out = np.empty((2 * len(parents_1), parents_1.shape[1]), dtype=parents_1.dtype)
+    np.copyto(out[0::2], parents_1)
+    np.copyto(out[0::2], parents_2, where=exchanged)
+    np.copyto(out[1::2], parents_2)
+    np.copyto(out[1::2], parents_1, where=exchanged)
+
+    return out
+
+
+# ------------ Permutation representation ------------
+
+# Partially mapped crossover (PMX)
+# used in problems with adjancency dependencies
+def partially_mapped_crossover(parent_1, parent_2):
+    permutation_size = len(parent_1)
+
+    # Generate random positions
+    poz_1 = np.random.randint(0, permutation_size - 1)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    child_1 = __pmx_helper__(parent_1, parent_2, poz_1, poz_2)
+    child_2 = __pmx_helper__(parent_2, parent_1, poz_1, poz_2)
+
+    return child_1, child_2
+
+
+# apply PMX on x, y of size n, with recombination/crossover sequence (p1, p2)
+def __pmx_helper__(parent_1, parent_2, poz_1, poz_2):
+    permutation_size = len(parent_1)
+    child = [-1] * permutation_size
+
+    # copy the sequence from between poz_1 and poz_2 from the first parent into the child
+    child[poz_1:poz_2 + 1] = parent_1[poz_1:poz_2 + 1]
+
+    # analyze the elements between poz_1 and poz_2 from the second parent
+    for i in range(poz_1, poz_2 + 1):
+        current_value = parent_2[i]
+        if current_value not in child:
+
+            # we check which value from parent 1 occupies the space we need to put our value in
+            element_in_parent_1 = parent_1[i]
+            # we need to know where we can find that element in the second parent
+            pos_in_parent_2 = parent_2.index(element_in_parent_1)
+
+            # if that position doesn't represent an empty space in the child we repeat the process until
+            # we find an empty position (marked by -1)
+            while child[pos_in_parent_2] != -1:
+                element_in_parent_1 = parent_1[pos_in_parent_2]
+                pos_in_parent_2 = parent_2.index(element_in_parent_1)
+
+            # when we find the empty space we fill it with our value
+            child[pos_in_parent_2] = current_value
+
+    # for the remaining empty values fill them with the values from the second parent
+    for i in range(permutation_size):
+        if child[i] == -1:
+            child[i] = parent_2[i]
+
+    return child
+
+
+# PMX applied on a whole population at once
+# population - ndarray (pop_size, n), each line is a permutation of 0...n-1
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# returns the children matrix (2k, n): line 2i is the child of (pairs[i, 0], pairs[i, 1]),
+# line 2i + 1 is the child of (pairs[i, 1], pairs[i, 0]) - the same crossover sequence is used for both
+# out - optional ndarray (2k, n) in which the children are written (ex. the buffer of the next generation)
+def partially_mapped_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    permutation_size = population.shape[1]
+    no_of_pairs = len(pairs)
+
+    # Generate random positions for all the pairs with a single call
+    poz_1 = np.random.randint(0, permutation_size - 1, no_of_pairs)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    # every child gets the first parent of its line, the second parent and the crossover sequence
+    parents_1 = population[pairs.ravel()]
+    parents_2 = population[pairs[:, ::-1].ravel()]
+
+    return __pmx_population_helper__(parents_1, parents_2, np.repeat(poz_1, 2), np.repeat(poz_2, 2), out)
+
+
+# apply PMX line by line on the matrices parents_1, parents_2, with the sequences (poz_1[i], poz_2[i])
+# instead of searching with .index we use the inverse permutation of the first parent: for a value
+# from the second parent which is already in the copied sequence we follow the mapping
+# parent_1[j] -> parent_2[j] until we find a value outside the sequence, so each child is O(n)
+def __pmx_population_helper__(parents_1, parents_2, poz_1, poz_2, out=None):
+    no_of_children, permutation_size = parents_1.shape
+    rows = np.arange(no_of_children)[:, None]
+    columns = np.arange(permutation_size)
+
+    # in_sequence[i, j] - position j of child i is copied from the first parent
+    in_sequence = (columns >= poz_1[:, None]) & (columns <= poz_2[:, None])
+
+    # inverse permutation of the first parent: pos_in_parent_1[i, value] = the position of value
+    pos_in_parent_1 = np.empty_like(parents_1)
+    pos_in_parent_1[rows, parents_1] = columns
+
+    # value_in_sequence[i, value] - value was copied from the first parent into child i
+    value_in_sequence = in_sequence[rows, pos_in_parent_1]
+
+    # copy the sequence from the first parent and everything else from the second parent
+    children = np.empty_like(parents_1) if out is None else out
+    np.copyto(children, parents_2)
+    np.copyto(children, parents_1, where=in_sequence)
+
+    # the conflicts - positions outside the sequence that received a value already in the child
+    conflict_rows, conflict_columns = np.nonzero(~in_sequence & value_in_sequence[rows, children])
+    values = children[conflict_rows, conflict_columns]
+
+    # follow the mapping only for the positions that are still in conflict
+    while len(values):
+        values = parents_2[conflict_rows, pos_in_parent_1[conflict_rows, values]]
+        solved = ~value_in_sequence[conflict_rows, values]
+        children[conflict_rows[solved], conflict_columns[solved]] = values[solved]
+        conflict_rows = conflict_rows[~solved]
+        conflict_columns = conflict_columns[~solved]
+        values = values[~solved]
+
+    return children
+
+
+# Order Crossover (OCX)
+def order_crossover(parent_1, parent_2):
+    permutation_size = len(parent_1)
+
+    # Generate random positions
+    poz_1 = np.random.randint(0, permutation_size - 1)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    child_1 = __ocx_helper__(parent_1, parent_2, permutation_size, poz_1, poz_2)
+    child_2 = __ocx_helper__(parent_2, parent_1, permutation_size, poz_1, poz_2)
+
+    return child_1, child_2
+
+
+def __ocx_helper__(parent_1, parent_2, size, poz_1, poz_2):
+    # initialize child with -1
+    child = [-1] * size
+
+    # copy content from between the positions of parent 1 into child
+    child[poz_1: poz_2 + 1] = parent_1[poz_1: poz_2 + 1]
+
+    # remember which genes are already in the child, so we don't have to search the child every time
+    placed = np.zeros(size, dtype=bool)
+    placed[child[poz_1: poz_2 + 1]] = True
+
+    # create 2 separate indexes to parse through the child and parent
+    i_child = (poz_2 + 1) % size
+    i_parent = poz_2
+
+    # because we may pass the max size of the arrays we need to add the "% size" to start from the begining
+    # parent 2 is parsed only once, every gene which is not yet placed goes into the next free position
+    for _ in range(size):
+        if not placed[parent_2[i_parent]]:
+            child[i_child] = parent_2[i_parent]
+            placed[parent_2[i_parent]] = True
+            i_child = (i_child + 1) % size
+
+        i_parent = (i_parent + 1) % size
+
+    return child
+
+
+# OCX applied on a whole population at once
+# population - ndarray (pop_size, n), each line is a permutation of 0...n-1
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# returns the children matrix (2k, n): line 2i is the child of (pairs[i, 0], pairs[i, 1]),
+# line 2i + 1 is the child of (pairs[i, 1], pairs[i, 0]) - the same crossover sequence is used for both
+# out - optional ndarray (2k, n) in which the children are written (ex. the buffer of the next generation)
+def order_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    permutation_size = population.shape[1]
+    no_of_pairs = len(pairs)
+
+    # Generate random positions for all the pairs with a single call
+    poz_1 = np.random.randint(0, permutation_size - 1, no_of_pairs)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    parents_1 = population[pairs.ravel()]
+    parents_2 = population[pairs[:, ::-1].ravel()]
+
+    return __ocx_population_helper__(parents_1, parents_2, np.repeat(poz_1, 2), np.repeat(poz_2, 2), out)
+
+
+# apply OCX line by line on the matrices parents_1, parents_2, with the sequences (poz_1[i], poz_2[i])
+def __ocx_population_helper__(parents_1, parents_2, poz_1, poz_2, out=None):
+    no_of_children, permutation_size = parents_1.shape
+    rows = np.arange(no_of_children)[:, None]
+    columns = np.arange(permutation_size)
+
+    # copy content from between the positions of parent 1 into the children
+    # (the other positions are all overwritten below, so the whole first parent is copied)
+    in_sequence = (columns >= poz_1[:, None]) & (columns <= poz_2[:, None])
+    children = np.empty_like(parents_1) if out is None else out
+    np.copyto(children, parents_1)
+
+    # placed[i, gene] - the gene was copied from the first parent into child i
+    placed = np.zeros((no_of_children, permutation_size), dtype=bool)
+    placed[rows, parents_1] = in_sequence
+
+    # parent 2 is read from poz_2 and the child is filled from poz_2 + 1, both wrapping around
+    parent_order = parents_2[rows, (poz_2[:, None] + columns) % permutation_size]
+    child_order = (poz_2[:, None] + 1 + columns) % permutation_size
+
+    # on every line the genes that are not placed and the free positions are equally many
+    # and both masks keep them in order, so they can be matched directly
+    genes_left = ~placed[rows, parent_order]
+    free_positions = ~in_sequence[rows, child_order]
+    children[np.nonzero(free_positions)[0], child_order[free_positions]] = parent_order[genes_left]
+
+    return children
+
+
+# Cycle Crossover (CX)
+# works on python lists and on ndarray lines (ex. the populations generated with np.random.permutation)
+def cycle_crossover(parent_1, parent_2):
+    parent_1 = np.asarray(parent_1)
+    parent_2 = np.asarray(parent_2)
+    permutation_size = len(parent_1)
+
+    # pos_in_parent_1[value] = the position of value in the first parent, so we don't need .index
+    pos_in_parent_1 = np.empty(permutation_size, dtype=int)
+    pos_in_parent_1[parent_1] = np.arange(permutation_size)
+
+    # we remember the cycle number of every position (0 = not yet part of a cycle)
+    # the cycles are numbered in the order of their first position, cycles of size 1 included
+    cycle_of_position = np.zeros(permutation_size, dtype=int)
+    cycle_no = 0
+
+    for i in range(permutation_size):
+        if cycle_of_position[i] == 0:
+            cycle_no += 1
+            cycle_index = i
+
+            # we move the index to the position denoted by the value we find in the second parent in the first one
+            while cycle_of_position[cycle_index] == 0:
+                cycle_of_position[cycle_index] = cycle_no
+                cycle_index = pos_in_parent_1[parent_2[cycle_index]]
+
+    # cycle with odd no. => parent 1 in child 1, parent 2 in child 2
+    # cycle with even no. => parent 2 in child 1, parent 1 in child 2
+    odd_cycle = cycle_of_position % 2 == 1
+    child_1 = np.where(odd_cycle, parent_1, parent_2)
+    child_2 = np.where(odd_cycle, parent_2, parent_1)
+
+    return child_1.tolist(), child_2.tolist()
+
+
+# CX applied on a whole population at once
+# population - ndarray (pop_size, n), each line is a permutation of 0...n-1
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# returns the children matrix (2k, n): lines 2i and 2i + 1 are the two children of (pairs[i, 0], pairs[i, 1])
+# out - optional ndarray (2k, n) in which the children are written (ex. the buffer of the next generation)
+def cycle_crossover_population(population, pairs, out=None):
+    population = np.asarray(population)
+    pairs = np.asarray(pairs)
+    parents_1 = population[pairs[:, 0]]
+    parents_2 = population[pairs[:, 1]]
+    no_of_pairs, permutation_size = parents_1.shape
+    rows = np.arange(no_of_pairs)[:, None]
+    columns = np.arange(permutation_size)
+
+    # the position which follows each position in its cycle
+    pos_in_parent_1 = np.empty_like(parents_1)
+    pos_in_parent_1[rows, parents_1] = columns
+    next_in_cycle = pos_in_parent_1[rows, parents_2]
+
+    # every position is labeled with the first (smallest) position of its cycle
+    # at step k the label is the minimum over 2^k successors, so log2(n) steps cover any cycle
+    first_in_cycle = np.broadcast_to(columns, parents_1.shape).copy()
+    for _ in range(max(1, int(np.ceil(np.log2(permutation_size))))):
+        np.minimum(first_in_cycle, first_in_cycle[rows, next_in_cycle], out=first_in_cycle)
+        next_in_cycle = next_in_cycle[rows, next_in_cycle]
+
+    # the cycles are numbered in the order of their first position, as in cycle_crossover
+    cycle_numbers = np.cumsum(first_in_cycle == columns, axis=1)
+    odd_cycle = cycle_numbers[rows, first_in_cycle] % 2 == 1
+
+    if out is None:
+        out = np.empty((2 * no_of_pairs, permutation_size), dtype=population.dtype)
+    np.copyto(out[0::2], parents_2)
+    np.copyto(out[0::2], parents_1, where=odd_cycle)
+    np.copyto(out[1::2], parents_1)
+    np.copyto(out[1::2], parents_2, where=odd_cycle)
+
+    return out
+
+
+# if you want to test the functions uncomment the following lines:
+# i = np.random.randint(5, 30)
+# p1 = np.random.permutation(i).tolist()
+# p2 = np.random.permutation(i).tolist()
+# print("Permutation 1 = " + str(p1))
+# print("Permutation 2 = " + str(p2))
+# c1, c2 = partially_mapped_crossover(p1, p2) # - change with the function name you want to change
+# print("Child 1 = " + str(c1))
+# print("Child 2 = " + str(c2))
+
+
+# EDGE CROSSOVER - optional
+
+# construieste tabela muchiilor pentru permutarile x si y de dimensiune n
+# E: vecini - matrice n x 4 de intregi, linia a contine vecinii lui a in x si y (-1 = loc liber)
+#    comun - matrice n x 4 de flag-uri, True daca muchia apare in ambii parinti (muchia '+')
+#    grad - vectorul numarului de vecini ai fiecarei alele
+def constr_tabel(x, y, n):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    vecini = -np.ones((n, 4), dtype='int')
+
+    # vecinii din x (stanga, dreapta) pe coloanele 0, 1 si vecinii din y pe coloanele 2, 3
+    vecini[x, 0] = np.roll(x, 1)
+    vecini[x, 1] = np.roll(x, -1)
+    vecini[y, 2] = np.roll(y, 1)
+    vecini[y, 3] = np.roll(y, -1)
+
+    # pentru n <= 2 vecinul din stanga coincide cu cel din dreapta - il pastram o singura data
+    vecini[vecini[:, 1] == vecini[:, 0], 1] = -1
+    vecini[vecini[:, 3] == vecini[:, 2], 3] = -1
+
+    # o muchie comuna apare o singura data in tabel, marcata in comun
+    comun = np.zeros((n, 4), dtype='bool')
+    for j in (2, 3):
+        for k in (0, 1):
+            dublura = (vecini[:, j] == vecini[:, k]) & (vecini[:, j] != -1)
+            comun[dublura, k] = True
+            vecini[dublura, j] = -1
+
+    grad = np.count_nonzero(vecini != -1, axis=1)
+    return vecini, comun, grad
+
+
+# alege alela urmatoare dintre vecinii lui a care nu au fost alesi
+# se prefera o muchie comuna, altfel vecinul cu cei mai putini vecini ramasi (primul, la egalitate)
+# intoarce -1 daca a nu mai are vecini disponibili
+def alege(a, vecini, comun, grad, ales):
+    alela = -1
+    for k in range(4):
+        b = vecini[a, k]
+        if b != -1 and not ales[b]:
+            if comun[a, k]:
+                return b
+            if alela == -1 or grad[b] < grad[alela]:
+                alela = b
+    return alela
+
+
+# ECX - Edge crossover
+# tabela muchiilor nu se modifica - o alela aleasa este doar marcata in ales, iar gradul
+# vecinilor ei este scazut cu 1, deci fiecare pas costa O(1)
+def ECX(x, y, n):
+    vecini, comun, grad = constr_tabel(x, y, n)
+    # permutarea rezultata
+    z = np.zeros(n, dtype='int')
+    # ales - vectorul flag al alelelor alese
+    ales = np.zeros(n, dtype='bool')
+    # ordinea in care se aleg alelele atunci cand nu exista vecini disponibili
+    rezerva = np.random.permutation(n)
+    k = 0
+    # alege initial prima alela din x
+    a = x[0]
+    for i in range(n):
+        if a == -1:
+            # alege aleator o alela neplasata
+            while ales[rezerva[k]]:
+                k = k + 1
+            a = rezerva[k]
+        # atribuie alela aleasa
+        z[i] = a
+        ales[a] = True
+        # sterge alela din listele vecinilor ei
+        for b in vecini[a]:
+            if b != -1:
+                grad[b] = grad[b] - 1
+        # alege alela de la urmatorul moment
+        a = alege(a, vecini, comun, grad, ales)
+    return z
+
+
+# APEL ECX
+# import numpy as np
+# import FunctiiCrossoverIndivizi as c
+# n=10
+# x=np.random.permutation(n)
+# y=np.random.permutation(n)
+# z=c.ECX(y,x,10)
+
+
+# ------------ Real value representation ------------
+
+
+# Arithmetic recombination - new value = alpha * parent_x[i] + (1 - alpha) * parent_y[i]
+
+# Single arithmetic recombination (one element)
+def single_arithmetic_crossover(parent_1, parent_2, alpha):
+    # randomly generates the element in which the crossover is made
+    parent_size = len(parent_1)
+    i = np.random.randint(0, parent_size)
+
+    child_1 = parent_1.copy()
+    child_2 = parent_2.copy()
+
+    child_1[i] = (alpha * parent_1[i] + (1 - alpha) * parent_2[i])
+    child_2[i] = (alpha * parent_2[i] + (1 - alpha) * parent_1[i])
+
+    return child_1, child_2
+
+
+# Simple arithmetic recombination (from a random element to the last one)
+def simple_arithmetic_crossover(parent_1, parent_2, alpha):
+    # randomly generates the element from which the crossover is made
+    parent_size = len(parent_1)
+    i = np.random.randint(0, parent_size)
+
+    child_1 = parent_1.copy()
+    child_2 = parent_2.copy()
+
+    # all the elements from i to the end are computed at once
+    tail_1 = np.asarray(parent_1[i:parent_size], dtype=float)
+    tail_2 = np.asarray(parent_2[i:parent_size], dtype=float)
+    child_1[i:parent_size] = (alpha * tail_1 + (1 - alpha) * tail_2).tolist()
+    child_2[i:parent_size] = (alpha * tail_2 + (1 - alpha) * tail_1).tolist()
+
+    return child_1, child_2
+
+
+# Total arithmetic recombination (all elements are changed)
+def crossover_total(parent_1, parent_2, alpha):
+    child_1 = parent_1.copy()
+    child_2 = parent_2.copy()
+
+    values_1 = np.asarray(parent_1, dtype=float)
+    values_2 = np.asarray(parent_2, dtype=float)
+    child_1[:] = (alpha * values_1 + (1 - alpha) * values_2).tolist()
+    child_2[:] = (alpha * values_2 + (1 - alpha) * values_1).tolist()
+
+    return child_1, child_2
+
+
+# The following operators work on a whole population at once
+# population - ndarray (pop_size, n) with real values
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# alpha - the same weight for all the pairs or an array with k weights, one for each pair
+# out - optional ndarray (2k, n) in which the children are written (ex. the buffer of the next generation)
+# they return the children matrix (2k, n): lines 2i and 2i + 1 are the two children of (pairs[i, 0], pairs[i, 1])
+
+# Single arithmetic recombination on a population (one random element for each pair)
+def single_arithmetic_crossover_population(population, pairs, alpha, out=None):
+    pairs = np.asarray(pairs)
+    parent_size = np.shape(population)[1]
+    i = np.random.randint(0, parent_size, len(pairs))
+    changed = np.arange(parent_size) == i[:, None]
+
+    return __arithmetic_population_helper__(population, pairs, alpha, changed, out)
+
+
+# Simple arithmetic recombination on a population (from a random element to the last one, for each pair)
+def simple_arithmetic_crossover_population(population, pairs, alpha, out=None):
+    pairs = np.asarray(pairs)
+    parent_size = np.shape(population)[1]
+    i = np.random.randint(0, parent_size, len(pairs))
+    changed = np.arange(parent_size) >= i[:, None]
+
+    return __arithmetic_population_helper__(population, pairs, alpha, changed, out)
+
+
+# Total arithmetic recombination on a population (all elements are changed)
+def total_arithmetic_crossover_population(population, pairs, alpha, out=None):
+    return __arithmetic_population_helper__(population, np.asarray(pairs), alpha, None, out)
+
+
+# child_1 = parent_1 - (1 - alpha) * (parent_1 - parent_2) on the changed elements, parent_1 elsewhere
+# child_2 = parent_2 + (1 - alpha) * (parent_1 - parent_2) on the changed elements, parent_2 elsewhere
+def __arithmetic_population_helper__(population, pairs, alpha, changed, out):
+    population = np.asarray(population, dtype=float)
+    parents_1 = population[pairs[:, 0]]
+    parents_2 = population[pairs[:, 1]]
+
+    # a weight for each pair is applied on its whole line
+    alpha = np.asarray(alpha, dtype=float)
+    if alpha.ndim == 1:
+        alpha = alpha[:, None]
+
+    difference = parents_1 - parents_2
+    difference *= 1 - alpha
+    if changed is not None:
+        difference *= changed
+
+    if out is None:
+        out = np.empty((2 * len(pairs), population.shape[1]), dtype=float)
+    np.subtract(parents_1, difference, out=out[0::2])
+    np.add(parents_2, difference, out=out[1::2])
+
+    return out
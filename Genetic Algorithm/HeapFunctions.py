@@ -0,0 +1,78 @@
+import numpy as np
+
+
+# ------------ Indexed min-heap of the fitness ------------
+
+# A heap is a list [order, positions, keys]:
+# order[i] - the individual on position i of the heap, the individual with the smallest fitness is order[0]
+# positions[individual] - the position of the individual in order
+# keys[individual] - the fitness of the individual
+# Because every individual knows its position, the fitness of any individual can be changed in O(log pop_size).
+# An update only sifts one individual through O(log pop_size) levels, comparing two keys and moving one
+# entry at each level, so the cost is the access to single elements: on python lists it is a few times faster
+# than on ndarrays, where every element read is converted to a numpy scalar.
+
+
+# creates the heap of the fitness array - the sorted order is already a heap
+def create_heap(fitness):
+    order = np.argsort(fitness, kind="stable")
+    positions = np.empty(len(order), dtype=int)
+    positions[order] = np.arange(len(order))
+    return [order.tolist(), positions.tolist(), np.asarray(fitness, dtype=float).tolist()]
+
+
+# the individual with the smallest fitness - O(1)
+def heap_min(heap):
+    return heap[0][0]
+
+
+# changes the fitness of the individual and restores the heap - O(log pop_size)
+def heap_update(heap, individual, key):
+    keys = heap[2]
+    old_key = keys[individual]
+    keys[individual] = key
+    if key < old_key:
+        __sift_up__(heap, heap[1][individual])
+    else:
+        __sift_down__(heap, heap[1][individual])
+
+
+# moves the individual from position up while its parent has a larger fitness
+def __sift_up__(heap, position):
+    order, positions, keys = heap
+    individual = order[position]
+    while position > 0:
+        parent = (position - 1) // 2
+        if keys[order[parent]] <= keys[individual]:
+            break
+        order[position] = order[parent]
+        positions[order[position]] = position
+        position = parent
+    order[position] = individual
+    positions[individual] = position
+
+
+# moves the individual from position down while one of its children has a smaller fitness
+def __sift_down__(heap, position):
+    order, positions, keys = heap
+    individual = order[position]
+    size = len(order)
+    while 2 * position + 1 < size:
+        child = 2 * position + 1
+        if child + 1 < size and keys[order[child + 1]] < keys[order[child]]:
+            child += 1
+        if keys[individual] <= keys[order[child]]:
+            break
+        order[position] = order[child]
+        positions[order[position]] = position
+        position = child
+    order[position] = individual
+    positions[individual] = position
+
+
+# Example in Python Console:
+# import numpy as np
+# import HeapFunctions as h
+# heap = h.create_heap(np.random.uniform(0, 1, 100))
+# worst = h.heap_min(heap)
+# h.heap_update(heap, worst, 2.0)
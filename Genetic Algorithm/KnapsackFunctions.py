@@ -0,0 +1,162 @@
+import numpy as np
+from MutationFunctions import mutation_positions
+from RepairFunctions import repair_binary_population, repair_real_population
+
+
+# ------------ Knapsack populations with running totals ------------
+
+# The population is a matrix (pop_size, n) (0/1 or real values) accompanied by the arrays total_costs and
+# total_values, the cost and the value of every individual.
+# The totals are computed once, with knapsack_totals, and then updated with the contribution of every changed
+# gene, so a mutation costs O(number of mutated genes) instead of summing all the n items again.
+# As in the mutatie_populatie drivers, the infeasible mutants are repaired (see RepairFunctions.py), but the
+# repair reads only the individuals whose total cost exceeds the capacity.
+# The population and the totals are modified in place. total_values can be None, if only the cost is needed
+# (ex. when the fitness is evaluated separately, as in the engine of the Genetic Algorithm folder).
+
+
+# the total cost and value of every individual - O(pop_size * n), once
+def knapsack_totals(population, costs, values):
+    return population @ np.asarray(costs, dtype=float), population @ np.asarray(values, dtype=float)
+
+
+# The mutations change every gene with probability pm, as the population operators of MutationFunctions.py,
+# and return the boolean array of the individuals which were mutated.
+
+# bit flip mutation on a 0/1 population
+def bit_flip_mutation_tracked(population, total_costs, total_values, costs, values, pm):
+    rows, columns = mutation_positions(*population.shape, pm)
+    new_genes = 1 - population[rows, columns]
+
+    return __change_genes__(population, total_costs, total_values, costs, values, rows, columns, new_genes)
+
+
+# uniform mutation on a real valued population
+def uniform_mutation_tracked(population, total_costs, total_values, costs, values, pm, lower_limit, upper_limit):
+    rows, columns = mutation_positions(*population.shape, pm)
+    new_genes = np.random.uniform(lower_limit, upper_limit, len(rows))
+
+    return __change_genes__(population, total_costs, total_values, costs, values, rows, columns, new_genes)
+
+
+# non-uniform (gaussian creep) mutation on a real valued population
+def non_uniform_mutation_tracked(population, total_costs, total_values, costs, values, pm, max_creep_value,
+                                 lower_limit, upper_limit):
+    rows, columns = mutation_positions(*population.shape, pm)
+    random_factor = np.random.normal(0, max_creep_value, len(rows))
+    new_genes = np.clip(population[rows, columns] + random_factor, lower_limit, upper_limit)
+
+    return __change_genes__(population, total_costs, total_values, costs, values, rows, columns, new_genes)
+
+
+# The repairs change only the individuals with total_costs > max_capacity, with the operators of
+# RepairFunctions.py, and return the boolean array of the repaired individuals.
+
+# repair of a 0-1 population
+def repair_binary_tracked(population, total_costs, total_values, costs, values, max_capacity, order,
+                          refill=False):
+    return __repair_rows__(population, total_costs, total_values, costs, values, max_capacity,
+                           repair_binary_population, order, refill)
+
+
+# repair of a population with real values in [0, upper_limit]
+def repair_real_tracked(population, total_costs, total_values, costs, values, max_capacity, order,
+                        refill=False, upper_limit=1):
+    return __repair_rows__(population, total_costs, total_values, costs, values, max_capacity,
+                           repair_real_population, order, refill, upper_limit)
+
+
+# writes the new genes on the positions (rows, columns) and adds the change of every individual to its totals
+def __change_genes__(population, total_costs, total_values, costs, values, rows, columns, new_genes):
+    pop_size = len(population)
+    # the difference is computed with real values, so the unsigned genes (uint8) do not wrap around
+    difference = np.subtract(new_genes, population[rows, columns], dtype=float)
+    population[rows, columns] = new_genes
+
+    total_costs += np.bincount(rows, weights=difference * costs[columns], minlength=pop_size)
+    if total_values is not None:
+        total_values += np.bincount(rows, weights=difference * values[columns], minlength=pop_size)
+
+    return np.bincount(rows, minlength=pop_size) > 0
+
+
+# repairs the infeasible individuals and updates their totals from the genes the repair changed
+def __repair_rows__(population, total_costs, total_values, costs, values, max_capacity, repair, order, *args):
+    costs = np.asarray(costs, dtype=float)
+    repaired = total_costs > max_capacity
+    infeasible = np.flatnonzero(repaired)
+    if len(infeasible) == 0:
+        return repaired
+
+    genes = population[infeasible]
+    new_genes = repair(genes, costs, max_capacity, order, *args)
+
+    # the genes which were not changed add 0 to the totals
+    difference = np.subtract(new_genes, genes, dtype=float)
+    total_costs[infeasible] += difference @ costs
+    if total_values is not None:
+        total_values[infeasible] += difference @ np.asarray(values, dtype=float)
+    population[infeasible] = new_genes
+
+    return repaired
+
+
+# ------------ Feasible initial populations ------------
+
+# The initial populations are generated directly feasible, in a batched call, without rejection
+# (as generate_feasible_population in the Gen Initial Pop folders of the knapsack problems).
+
+# population_size feasible 0/1 candidates: every candidate parses the items in a random order and takes each item
+# which still fits in the knapsack, so the generation always ends after n steps, however small max_capacity is
+def generate_feasible_binary_population(population_size, costs, max_capacity):
+    costs = np.asarray(costs, dtype=float)
+    individual_size = len(costs)
+    population = np.zeros((population_size, individual_size), dtype=int)
+    total_costs = np.zeros(population_size)
+    lines = np.arange(population_size)
+
+    # a random order of the items for each candidate
+    order = np.argsort(np.random.uniform(0, 1, (population_size, individual_size)), axis=1)
+
+    for j in range(individual_size):
+        item = order[:, j]
+        fits = total_costs + costs[item] <= max_capacity
+        population[lines[fits], item[fits]] = 1
+        total_costs[fits] += costs[item[fits]]
+
+    return population
+
+
+# population_size feasible candidates from [0, 1]^n: the candidates are sampled in [0,1]^n and every candidate
+# which costs more than max_capacity is scaled down onto the capacity constraint, in one pass
+# latin_hypercube - if True, on every item each of the intervals [k/population_size, (k+1)/population_size)
+#                   receives exactly one candidate, for a more diverse population
+def generate_feasible_real_population(population_size, costs, max_capacity, latin_hypercube=False):
+    costs = np.asarray(costs, dtype=float)
+    individual_size = len(costs)
+
+    if latin_hypercube:
+        strata = np.argsort(np.random.uniform(0, 1, (population_size, individual_size)), axis=0)
+        population = (strata + np.random.uniform(0, 1, (population_size, individual_size))) / population_size
+    else:
+        population = np.random.uniform(0, 1, (population_size, individual_size))
+
+    # the scale factor is 1 for the feasible candidates and (just below) max_capacity / cost for the others,
+    # so that the rounded cost of a scaled candidate is still under max_capacity
+    total_costs = population @ costs
+    scale = np.minimum(1, (1 - 1e-12) * max_capacity / np.maximum(total_costs, np.finfo(float).tiny))
+
+    return population * scale[:, None]
+
+
+# Example in Python Console:
+# import numpy as np
+# import KnapsackFunctions as k
+# from RepairFunctions import ratio_order
+# c = np.genfromtxt("cost.txt")
+# v = np.genfromtxt("valoare.txt")
+# x = k.generate_feasible_binary_population(20, c, 50)
+# cost, val = k.knapsack_totals(x, c, v)
+# mutated = k.bit_flip_mutation_tracked(x, cost, val, c, v, 0.2)
+# repaired = k.repair_binary_tracked(x, cost, val, c, v, 50, ratio_order(c, v))
+# population = k.generate_feasible_real_population(20, c, 50, latin_hypercube=True)
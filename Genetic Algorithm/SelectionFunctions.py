@@ -0,0 +1,120 @@
+import numpy as np
+from HeapFunctions import heap_min
+
+
+# ------------ Parent selection ------------
+
+# The functions work on the array of the fitness of the population, as the drivers produce it:
+# val in TSP, pop[:, n] in N Queens, the last element of the individuals in the knapsack problems.
+# A larger fitness is better. They return the indexes of the no_of_parents selected parents
+# (an individual can be selected several times) and consecutive indexes form a pair: 0,1 then 2,3 and so on.
+# All the parents are drawn together, without a loop over the individuals - O(pop_size * log(pop_size)).
+
+
+# k-way tournament - each parent is the best of k individuals drawn at random (with replacement)
+def tournament_selection(fitness, no_of_parents, k=2):
+    fitness = np.asarray(fitness)
+    contestants = np.random.randint(0, len(fitness), (no_of_parents, k))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(no_of_parents), winners]
+
+
+# roulette wheel - an individual is selected with probability fitness / the sum of fitness
+# the fitness must be non-negative
+def roulette_selection(fitness, no_of_parents):
+    wheel = __wheel__(fitness)
+    return __spin__(wheel, np.random.uniform(0, wheel[-1], no_of_parents))
+
+
+# stochastic universal sampling - the same probabilities as the roulette wheel, but with no_of_parents
+# equally spaced pointers and a single random number, so an individual is selected floor or ceil of
+# its expected number of times
+# the fitness must be non-negative
+def stochastic_universal_sampling(fitness, no_of_parents):
+    wheel = __wheel__(fitness)
+    spacing = wheel[-1] / no_of_parents
+    pointers = (np.random.uniform(0, 1) + np.arange(no_of_parents)) * spacing
+    # the pointers select the parents in the order of the population, so they are shuffled before pairing
+    return np.random.permutation(__spin__(wheel, pointers))
+
+
+# the cumulative sums of the fitness - if all the fitness values are 0, every individual gets the same chance
+def __wheel__(fitness):
+    fitness = np.asarray(fitness, dtype=float)
+    if not fitness.sum() > 0:
+        fitness = np.ones(len(fitness))
+    return np.cumsum(fitness)
+
+
+# the individual of every pointer: the first one whose cumulative sum is larger than the pointer
+# (an individual with fitness 0 is never selected)
+def __spin__(wheel, pointers):
+    return np.minimum(np.searchsorted(wheel, pointers, side='right'), len(wheel) - 1)
+
+
+# ------------ Survivor selection ------------
+
+# The functions choose the next generation from the pool of the pop_size parents and their offspring.
+# fitness - the fitness of the pool: the parents on positions 0...pop_size-1, followed by the offspring
+# They return the pop_size indexes of the survivors in the pool, in no particular order.
+# The best individuals are found with np.argpartition - O(pool size), without sorting the pool.
+
+
+# generational replacement - the first pop_size offspring replace the parents
+def generational_survivors(fitness, pop_size):
+    return np.arange(pop_size, 2 * pop_size)
+
+
+# (mu + lambda) - the best pop_size individuals of the parents and the offspring together
+def plus_survivors(fitness, pop_size):
+    return __best__(fitness, pop_size)
+
+
+# (mu, lambda) - the best pop_size offspring, the parents are dropped
+# there must be at least pop_size offspring
+def comma_survivors(fitness, pop_size):
+    return pop_size + __best__(fitness[pop_size:], pop_size)
+
+
+# elitism - the k best parents survive, together with the best pop_size - k offspring
+# there must be at least pop_size - k offspring
+def elitist_survivors(fitness, pop_size, k=1):
+    survivors = np.empty(pop_size, dtype=int)
+    survivors[:k] = __best__(fitness[:pop_size], k)
+    survivors[k:] = pop_size + __best__(fitness[pop_size:], pop_size - k)
+    return survivors
+
+
+# the indexes of the size largest values of fitness
+def __best__(fitness, size):
+    if size >= len(fitness):
+        return np.arange(len(fitness))
+    if size <= 0:
+        return np.zeros(0, dtype=int)
+    return np.argpartition(fitness, len(fitness) - size)[len(fitness) - size:]
+
+
+# ------------ Replacement for the steady-state mode ------------
+
+# The functions choose the individual of the population which is replaced by a child.
+# heap - the indexed min-heap of the fitness of the population (see HeapFunctions.py), fitness - the fitness array
+
+
+# the worst individual - the top of the heap, O(1)
+def replace_worst(heap, fitness):
+    return heap_min(heap)
+
+
+# the loser of a k-way tournament - the worst of k individuals drawn at random (with replacement)
+def replace_tournament_loser(heap, fitness, k=2):
+    contestants = np.random.randint(0, len(fitness), k)
+    return contestants[np.argmin(fitness[contestants])]
+
+
+# Example in Python Console:
+# import numpy as np
+# import SelectionFunctions as s
+# fitness = np.random.uniform(0, 1, 100)
+# parents = s.tournament_selection(fitness, 100, 3)
+# pairs = parents.reshape(-1, 2)
+# survivors = s.elitist_survivors(np.random.uniform(0, 1, 200), 100, 5)
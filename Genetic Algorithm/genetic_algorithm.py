@@ -0,0 +1,177 @@
+import numpy as np
+from SelectionFunctions import tournament_selection, elitist_survivors, replace_worst
+from HeapFunctions import create_heap, heap_update
+
+
+# ------------ Generational genetic algorithm ------------
+
+# A problem is a dictionary with its data and the functions which work on the whole population matrix at once
+# (the adapters for Knapsack 0-1, Knapsack Continous, N Queens and TSP are in problems.py):
+# 'n' - the dimension of the problem (the number of genes), 'dtype' - the type of the genes
+# 'initialize'(problem, pop_size) - the initial population (pop_size, n)
+# 'evaluate'(problem, population, out) - writes the fitness of every individual in out (larger is better)
+# 'crossover'(problem, population, pairs, out) - writes the children (2k, n) of the pairs (k, 2) in out:
+#                                                lines 2i and 2i + 1 are the children of pair i
+# 'mutation'(problem, population, pm) - mutates the population in place
+# The functions are module level functions, not closures, so a problem can be sent to other processes.
+#
+# The engine allocates two pools and their fitness arrays once. A pool holds the pop_size parents on its first
+# lines, followed by their offspring. Every generation the offspring are written after the parents, the survivors
+# are gathered from the pool into the first lines of the other pool, which then becomes the current one.
+# The crossover, the mutation and the repair write their results directly in the offspring lines, so no
+# population is concatenated or copied back; the operators still allocate their temporary arrays (the gathered
+# parents, the masks and the positions of the changed genes) every generation.
+
+
+# the parents are taken in a random order, as in the TSP crossover driver - no selection pressure
+# returns the indexes of the no_of_parents selected parents, consecutive indexes form a pair
+def random_selection(fitness, no_of_parents):
+    return np.resize(np.random.permutation(len(fitness)), no_of_parents)
+
+
+# runs the generational genetic algorithm
+# pc - the crossover probability of a pair, pm - the mutation probability (as in the mutatie_populatie drivers)
+# selection - selection(fitness, no_of_parents) returns the indexes of the parents (see SelectionFunctions.py)
+# survivors - survivors(pool_fitness, pop_size) returns the indexes of the next generation in the pool
+#             of the parents and the offspring (see SelectionFunctions.py)
+# no_of_offspring - the number of children of every generation (pop_size, if missing)
+# buffers - the pools and their fitness arrays, if they are allocated by the caller (as allocate_buffers does),
+#           for example in shared memory (see shared_population.py)
+# returns the best individual found, its fitness and the array with the best fitness after every generation
+def run_generational(problem, pop_size, no_of_generations, pc, pm, selection=tournament_selection,
+                     survivors=elitist_survivors, no_of_offspring=None, buffers=None):
+    if no_of_offspring is None:
+        no_of_offspring = pop_size
+    if buffers is None:
+        buffers = allocate_buffers(problem, pop_size, no_of_offspring)
+
+    pools, pool_fitnesses = buffers
+    best_individual = np.empty(problem['n'], dtype=problem['dtype'])
+    history = np.empty(no_of_generations + 1)
+
+    current = 0
+    population, fitness = pools[current][:pop_size], pool_fitnesses[current][:pop_size]
+    population[:] = problem['initialize'](problem, pop_size)
+    problem['evaluate'](problem, population, fitness)
+    best_fitness = __update_best__(population, fitness, best_individual, -np.inf)
+    history[0] = best_fitness
+
+    for generation in range(1, no_of_generations + 1):
+        current = generation_step(problem, pools, pool_fitnesses, current, pop_size, no_of_offspring,
+                                  pc, pm, selection, survivors)
+        population, fitness = pools[current][:pop_size], pool_fitnesses[current][:pop_size]
+        best_fitness = __update_best__(population, fitness, best_individual, best_fitness)
+        history[generation] = best_fitness
+
+    return best_individual, best_fitness, history
+
+
+# one generation: the offspring of the current pool are created and the survivors are gathered in the other pool
+# returns the index of the pool which holds the new population
+def generation_step(problem, pools, pool_fitnesses, current, pop_size, no_of_offspring, pc, pm, selection,
+                    survivors):
+    pool, pool_fitness = pools[current], pool_fitnesses[current]
+    next_generation(problem, pool[:pop_size], pool_fitness[:pop_size], pool[pop_size:], pool_fitness[pop_size:],
+                    pc, pm, selection)
+
+    # if no_of_offspring is odd, the last child is dropped
+    chosen = survivors(pool_fitness[:pop_size + no_of_offspring], pop_size)
+    np.take(pool, chosen, axis=0, out=pools[1 - current][:pop_size])
+    np.take(pool_fitness, chosen, out=pool_fitnesses[1 - current][:pop_size])
+
+    return 1 - current
+
+
+# the two pools and their fitness arrays
+# the offspring take no_of_offspring rounded up to an even number of lines, because the children come in pairs
+def allocate_buffers(problem, pop_size, no_of_offspring):
+    buffer_size = pop_size + no_of_offspring + no_of_offspring % 2
+    pools = [np.empty((buffer_size, problem['n']), dtype=problem['dtype']) for _ in range(2)]
+    pool_fitnesses = [np.empty(buffer_size) for _ in range(2)]
+    return pools, pool_fitnesses
+
+
+# writes the children of population in the offspring buffers: selection, crossover, mutation, evaluation
+def next_generation(problem, population, fitness, offspring, offspring_fitness, pc, pm, selection):
+    pairs = selection(fitness, len(offspring)).reshape(-1, 2)
+
+    # for every pair randomly generate if the crossover is being made - a single call
+    # the recombined pairs are moved first, so their children take the first lines of the offspring
+    recombined = np.random.uniform(0, 1, len(pairs)) <= pc
+    pairs = np.concatenate((pairs[recombined], pairs[~recombined]))
+    no_of_children = 2 * np.count_nonzero(recombined)
+
+    if no_of_children:
+        problem['crossover'](problem, population, pairs[:no_of_children // 2], offspring[:no_of_children])
+    # asexual recombination - the other parents are copied in the offspring population
+    np.take(population, pairs[no_of_children // 2:].ravel(), axis=0, out=offspring[no_of_children:])
+
+    problem['mutation'](problem, offspring, pm)
+    problem['evaluate'](problem, offspring, offspring_fitness)
+
+
+# copies the best individual of the population in best_individual, if it is better than best_fitness
+# returns the best fitness
+def __update_best__(population, fitness, best_individual, best_fitness):
+    best = np.argmax(fitness)
+    if fitness[best] > best_fitness:
+        best_individual[:] = population[best]
+        best_fitness = fitness[best]
+    return best_fitness
+
+
+# ------------ Steady-state genetic algorithm ------------
+
+# Every step a few parents are selected and their children are created in a small preallocated buffer.
+# Each child replaces an individual of the population in place: the worst one or the loser of a tournament.
+# The fitness is also kept in an indexed min-heap, so the worst individual is found in O(1) and the heap is
+# updated after a replacement in O(log pop_size) - the population is never copied.
+
+
+# runs the steady-state genetic algorithm
+# pc, pm, selection - as in run_generational (a selection which is O(k), as the tournament, keeps a step cheap)
+# replacement - replacement(heap, fitness) returns the individual replaced by a child (see SelectionFunctions.py)
+# no_of_children - the number of children created every step
+# returns the best individual found, its fitness and the array with the best fitness after every step
+def run_steady_state(problem, pop_size, no_of_steps, pc, pm, selection=tournament_selection,
+                     replacement=replace_worst, no_of_children=2):
+    population = np.empty((pop_size, problem['n']), dtype=problem['dtype'])
+    fitness = np.empty(pop_size)
+    children = np.empty((no_of_children + no_of_children % 2, problem['n']), dtype=problem['dtype'])
+    children_fitness = np.empty(len(children))
+    best_individual = np.empty(problem['n'], dtype=problem['dtype'])
+    history = np.empty(no_of_steps + 1)
+
+    population[:] = problem['initialize'](problem, pop_size)
+    problem['evaluate'](problem, population, fitness)
+    heap = create_heap(fitness)
+    best_fitness = __update_best__(population, fitness, best_individual, -np.inf)
+    history[0] = best_fitness
+
+    for step in range(1, no_of_steps + 1):
+        next_generation(problem, population, fitness, children, children_fitness, pc, pm, selection)
+
+        # if no_of_children is odd, the last child is dropped
+        for child in range(no_of_children):
+            replaced = replacement(heap, fitness)
+            population[replaced] = children[child]
+            fitness[replaced] = children_fitness[child]
+            heap_update(heap, replaced, float(children_fitness[child]))
+
+        best_fitness = __update_best__(children[:no_of_children], children_fitness[:no_of_children],
+                                       best_individual, best_fitness)
+        history[step] = best_fitness
+
+    return best_individual, best_fitness, history
+
+
+# Example in Python Console:
+# import numpy as np
+# import problems as pr
+# import genetic_algorithm as ga
+# problem = pr.knapsack_01_problem(np.genfromtxt("cost.txt"), np.genfromtxt("valoare.txt"), 50)
+# best, best_fitness, history = ga.run_generational(problem, 20, 100, 0.8, 0.1)
+# import SelectionFunctions as s
+# best, best_fitness, history = ga.run_generational(problem, 20, 100, 0.8, 0.1, s.stochastic_universal_sampling)
+# best, best_fitness, history = ga.run_generational(problem, 20, 100, 0.8, 0.1, survivors=s.plus_survivors)
+# best, best_fitness, history = ga.run_steady_state(problem, 20, 1000, 0.8, 0.1)
@@ -0,0 +1,133 @@
+import numpy as np
+from multiprocessing import Pipe, Process
+from SelectionFunctions import tournament_selection, elitist_survivors
+from genetic_algorithm import allocate_buffers, generation_step
+
+
+# ------------ Island model ------------
+
+# The population is split in no_of_islands sub-populations (islands), each of them evolved by the generational
+# engine of genetic_algorithm.py in its own process, so the islands run on different cores.
+# Every migration_interval generations (an epoch) each island sends its no_of_migrants best individuals to
+# the main process, which forwards them to the neighbour island, where they replace the worst individuals.
+# topology - 'ring': island i sends to island i + 1
+#            'random': every epoch the islands are arranged in a new random ring
+# The migrants travel through pipes as the raw bytes of their genome and fitness arrays (int32 permutations,
+# uint8 for Knapsack 0-1, float for Knapsack Continous) - the populations themselves never leave their process.
+# On the systems which start the processes by spawn, the call must be protected by if __name__ == "__main__".
+
+
+# runs the island model
+# pop_size - the size of every island, no_of_epochs - the number of migrations
+# pc, pm, selection, survivors - as in run_generational
+# returns the best individual found, its fitness and the array with the best fitness after every epoch
+def run_islands(problem, no_of_islands, pop_size, no_of_epochs, migration_interval, pc, pm, no_of_migrants=1,
+                topology='ring', selection=tournament_selection, survivors=elitist_survivors):
+    connections = []
+    processes = []
+    seeds = np.random.randint(0, 2 ** 31 - 1, no_of_islands)
+    for island in range(no_of_islands):
+        connection, island_connection = Pipe()
+        process = Process(target=__island_worker__,
+                          args=(problem, island_connection, pop_size, no_of_migrants, pc, pm, selection,
+                                survivors, seeds[island]),
+                          daemon=True)
+        process.start()
+        connections.append(connection)
+        processes.append(process)
+
+    best_individual = np.empty(problem['n'], dtype=problem['dtype'])
+    best_fitness = -np.inf
+    history = np.empty(no_of_epochs)
+
+    try:
+        for epoch in range(no_of_epochs):
+            for connection in connections:
+                connection.send(migration_interval)
+            migrants = [__receive_individuals__(connection, problem) for connection in connections]
+
+            # the best individual of every island is among its migrants
+            for genomes, fitness in migrants:
+                best = np.argmax(fitness)
+                if fitness[best] > best_fitness:
+                    best_individual[:] = genomes[best]
+                    best_fitness = fitness[best]
+            history[epoch] = best_fitness
+
+            for island, target in enumerate(migration_targets(no_of_islands, topology)):
+                __send_individuals__(connections[target], *migrants[island])
+    except BaseException:
+        # an island may be waiting in the middle of a migration, so the processes are stopped
+        for process in processes:
+            process.terminate()
+        raise
+
+    for connection in connections:
+        connection.send(None)
+    for process in processes:
+        process.join()
+
+    return best_individual, best_fitness, history
+
+
+# the island which receives the migrants of every island
+def migration_targets(no_of_islands, topology='ring'):
+    if topology == 'random':
+        ring = np.random.permutation(no_of_islands)
+    else:
+        ring = np.arange(no_of_islands)
+    targets = np.empty(no_of_islands, dtype=int)
+    targets[ring] = np.roll(ring, -1)
+    return targets
+
+
+# the process of an island: it waits for the number of generations of the epoch (None - stop),
+# evolves its population, sends its best individuals and puts the received ones instead of its worst individuals
+def __island_worker__(problem, connection, pop_size, no_of_migrants, pc, pm, selection, survivors, seed):
+    np.random.seed(seed)
+    pools, pool_fitnesses = allocate_buffers(problem, pop_size, pop_size)
+    current = 0
+    population, fitness = pools[current][:pop_size], pool_fitnesses[current][:pop_size]
+    population[:] = problem['initialize'](problem, pop_size)
+    problem['evaluate'](problem, population, fitness)
+
+    while True:
+        no_of_generations = connection.recv()
+        if no_of_generations is None:
+            break
+
+        for generation in range(no_of_generations):
+            current = generation_step(problem, pools, pool_fitnesses, current, pop_size, pop_size,
+                                      pc, pm, selection, survivors)
+        population, fitness = pools[current][:pop_size], pool_fitnesses[current][:pop_size]
+
+        best = np.argpartition(fitness, pop_size - no_of_migrants)[pop_size - no_of_migrants:]
+        __send_individuals__(connection, population[best], fitness[best])
+
+        genomes, genomes_fitness = __receive_individuals__(connection, problem)
+        worst = np.argpartition(fitness, no_of_migrants - 1)[:no_of_migrants]
+        population[worst] = genomes
+        fitness[worst] = genomes_fitness
+
+    connection.close()
+
+
+# the genomes and the fitness are sent as raw bytes
+def __send_individuals__(connection, genomes, fitness):
+    connection.send_bytes(np.ascontiguousarray(genomes).tobytes())
+    connection.send_bytes(np.ascontiguousarray(fitness, dtype=float).tobytes())
+
+
+# the type and the number of genes are known from the problem
+def __receive_individuals__(connection, problem):
+    genomes = np.frombuffer(connection.recv_bytes(), dtype=problem['dtype']).reshape(-1, problem['n'])
+    fitness = np.frombuffer(connection.recv_bytes(), dtype=float)
+    return genomes, fitness
+
+
+# Example in Python Console:
+# import numpy as np
+# import problems as pr
+# import island_model as im
+# problem = pr.tsp_problem(np.genfromtxt("costuri.txt"))
+# best, best_fitness, history = im.run_islands(problem, 4, 50, 20, 10, 0.8, 0.2, 2, 'random')
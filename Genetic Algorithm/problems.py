@@ -0,0 +1,177 @@
+import numpy as np
+from FunctiiCrossoverIndivizi import uniform_crossover_population, single_arithmetic_crossover_population
+from FunctiiCrossoverIndivizi import order_crossover_population, partially_mapped_crossover_population
+from MutationFunctions import insertion_mutation_population, inversion_mutation_population
+from RepairFunctions import ratio_order
+from KnapsackFunctions import bit_flip_mutation_tracked, non_uniform_mutation_tracked
+from KnapsackFunctions import repair_binary_tracked, repair_real_tracked
+from KnapsackFunctions import generate_feasible_binary_population, generate_feasible_real_population
+
+
+# ------------ Problems for the genetic algorithm ------------
+
+# Every function below builds the dictionary of a problem, as described in genetic_algorithm.py.
+# The operators are the ones used by the crossover and mutation drivers of each problem.
+# The knapsack individuals are always feasible: the infeasible children and mutants are repaired.
+# The knapsack operators compute the total cost of the offspring once and keep it up to date from the changed
+# genes (see KnapsackFunctions.py), so the repair reads only the individuals which exceed the capacity.
+# The crossover writes the children in the out lines and the mutation and the repair work in place, on the
+# offspring buffer of the engine.
+
+
+# ------------ Knapsack 0-1 ------------
+
+# the genes are 0/1 values of type uint8, the fitness is the value of the knapsack
+def knapsack_01_problem(costs, values, max_capacity):
+    costs = np.asarray(costs, dtype=float)
+    values = np.asarray(values, dtype=float)
+    return {'n': len(costs), 'dtype': np.uint8,
+            'costs': costs, 'values': values, 'max_capacity': max_capacity, 'order': ratio_order(costs, values),
+            'initialize': knapsack_01_initialize, 'evaluate': knapsack_evaluate,
+            'crossover': knapsack_01_crossover, 'mutation': knapsack_01_mutation}
+
+
+# feasible 0/1 individuals, filled greedily with the items in a random order
+def knapsack_01_initialize(problem, pop_size):
+    return generate_feasible_binary_population(pop_size, problem['costs'], problem['max_capacity'])
+
+
+# the value of every individual
+def knapsack_evaluate(problem, population, out):
+    np.dot(population, problem['values'], out=out)
+
+
+# uniform crossover
+def knapsack_01_crossover(problem, population, pairs, out):
+    uniform_crossover_population(population, pairs, out)
+    repair_binary_tracked(out, out @ problem['costs'], None, problem['costs'], problem['values'],
+                          problem['max_capacity'], problem['order'])
+
+
+# bit flip mutation
+def knapsack_01_mutation(problem, population, pm):
+    total_costs = population @ problem['costs']
+    bit_flip_mutation_tracked(population, total_costs, None, problem['costs'], problem['values'], pm)
+    repair_binary_tracked(population, total_costs, None, problem['costs'], problem['values'],
+                          problem['max_capacity'], problem['order'])
+
+
+# ------------ Knapsack Continous ------------
+
+# the genes are real values from [0, 1], the fitness is the value of the knapsack
+# alpha - the parameter of the arithmetic crossover, sigma - the standard deviation of the non-uniform mutation
+# latin_hypercube - if True, the initial population is sampled by latin hypercube
+def knapsack_continous_problem(costs, values, max_capacity, alpha=0.5, sigma=0.1, latin_hypercube=False):
+    costs = np.asarray(costs, dtype=float)
+    values = np.asarray(values, dtype=float)
+    return {'n': len(costs), 'dtype': float,
+            'costs': costs, 'values': values, 'max_capacity': max_capacity, 'order': ratio_order(costs, values),
+            'alpha': alpha, 'sigma': sigma, 'latin_hypercube': latin_hypercube,
+            'initialize': knapsack_continous_initialize, 'evaluate': knapsack_evaluate,
+            'crossover': knapsack_continous_crossover, 'mutation': knapsack_continous_mutation}
+
+
+# random individuals from [0, 1]^n, scaled down onto the capacity if they do not fit
+def knapsack_continous_initialize(problem, pop_size):
+    return generate_feasible_real_population(pop_size, problem['costs'], problem['max_capacity'],
+                                             problem['latin_hypercube'])
+
+
+# single arithmetic crossover
+def knapsack_continous_crossover(problem, population, pairs, out):
+    single_arithmetic_crossover_population(population, pairs, problem['alpha'], out)
+    repair_real_tracked(out, out @ problem['costs'], None, problem['costs'], problem['values'],
+                        problem['max_capacity'], problem['order'])
+
+
+# non-uniform mutation
+def knapsack_continous_mutation(problem, population, pm):
+    total_costs = population @ problem['costs']
+    non_uniform_mutation_tracked(population, total_costs, None, problem['costs'], problem['values'], pm,
+                                 problem['sigma'], 0, 1)
+    repair_real_tracked(population, total_costs, None, problem['costs'], problem['values'],
+                        problem['max_capacity'], problem['order'])
+
+
+# ------------ N Queens ------------
+
+# the genes are the permutation of the columns of the queens, the fitness is the number of pairs of queens
+# which are not attacking each other (as foNR)
+def n_queens_problem(n):
+    return {'n': n, 'dtype': np.int32,
+            'initialize': permutation_initialize, 'evaluate': n_queens_evaluate,
+            'crossover': n_queens_crossover, 'mutation': n_queens_mutation}
+
+
+# random permutations
+def permutation_initialize(problem, pop_size):
+    return np.argsort(np.random.uniform(0, 1, (pop_size, problem['n'])), axis=1)
+
+
+# the diagonals of every individual are numbered separately, so all the queens are counted with one bincount
+def n_queens_evaluate(problem, population, out):
+    pop_size, n = population.shape
+    rows = np.arange(n)
+    shift = (2 * n - 1) * np.arange(pop_size)[:, None]
+
+    sum_diagonals = np.bincount((rows + population + shift).ravel(), minlength=pop_size * (2 * n - 1))
+    difference_diagonals = np.bincount((rows - population + n - 1 + shift).ravel(),
+                                       minlength=pop_size * (2 * n - 1))
+
+    # k queens on the same diagonal form k(k-1)/2 attacking pairs
+    conflicts = ((sum_diagonals * (sum_diagonals - 1)).reshape(pop_size, -1).sum(axis=1)
+                 + (difference_diagonals * (difference_diagonals - 1)).reshape(pop_size, -1).sum(axis=1)) // 2
+    out[:] = n * (n - 1) / 2 - conflicts
+
+
+# order crossover
+def n_queens_crossover(problem, population, pairs, out):
+    order_crossover_population(population, pairs, out)
+
+
+# insertion mutation of the individuals selected with probability pm
+def n_queens_mutation(problem, population, pm):
+    insertion_mutation_population(population, np.random.uniform(0, 1, len(population)) <= pm, out=population)
+
+
+# ------------ TSP ------------
+
+# the genes are the permutation of the cities, the fitness is 100 / the length of the tour (as foTSP)
+# block - the maximum number of elements of the temporary matrices of the evaluation
+def tsp_problem(contiguity_matrix, block=1 << 22):
+    contiguity_matrix = np.asarray(contiguity_matrix, dtype=float)
+    return {'n': len(contiguity_matrix), 'dtype': np.int32,
+            'contiguity_matrix': contiguity_matrix, 'block': block,
+            'initialize': permutation_initialize, 'evaluate': tsp_evaluate,
+            'crossover': tsp_crossover, 'mutation': tsp_mutation}
+
+
+# the population is parsed in blocks of lines, so the temporary matrices have at most block elements
+def tsp_evaluate(problem, population, out):
+    contiguity_matrix = problem['contiguity_matrix']
+    pop_size, n = population.shape
+    step = max(1, problem['block'] // n)
+    for k in range(0, pop_size, step):
+        tours = population[k:k + step]
+        lengths = (contiguity_matrix[tours[:, :n - 1], tours[:, 1:]].sum(axis=1)
+                   + contiguity_matrix[tours[:, 0], tours[:, n - 1]])
+        out[k:k + step] = 100 / lengths
+
+
+# partially mapped crossover
+def tsp_crossover(problem, population, pairs, out):
+    partially_mapped_crossover_population(population, pairs, out)
+
+
+# inversion mutation of the individuals selected with probability pm
+def tsp_mutation(problem, population, pm):
+    inversion_mutation_population(population, np.random.uniform(0, 1, len(population)) <= pm, out=population)
+
+
+# Example in Python Console:
+# import numpy as np
+# import problems as pr
+# problem = pr.tsp_problem(np.genfromtxt("costuri.txt"))
+# population = problem['initialize'](problem, 10)
+# fitness = np.empty(10)
+# problem['evaluate'](problem, population, fitness)
@@ -0,0 +1,179 @@
+import numpy as np
+from multiprocessing import Barrier, Process, RawArray
+from multiprocessing.shared_memory import SharedMemory
+from genetic_algorithm import allocate_buffers
+
+
+# ------------ Populations in shared memory ------------
+
+# The two pools of the generational engine (genomes and fitness, as allocate_buffers creates them) and the arrays
+# of the problem (the costuri.txt matrix, the cost and value vectors) are placed in multiprocessing.shared_memory.
+# The evaluator processes attach to the same memory once, so nothing is pickled during the run: every generation
+# the main process writes the region to evaluate in a small shared task array and the evaluators compute the
+# fitness of their part of the rows in place, between two waits on a barrier.
+# The fitness equals the one of the serial evaluation, up to the floating-point rounding of the evaluations which
+# add in a different order on chunks of rows (the dot products of the knapsack problems).
+#
+# A shared population is a dictionary:
+# 'blocks' - the SharedMemory blocks, 'layout' - name: (block name, shape, dtype) of every array,
+# 'arrays' - name: the ndarray on the block - 'genomes' (2, buffer_size, n), 'fitness' (2, buffer_size)
+# and the arrays of the problem, under their names from the problem dictionary.
+
+
+# creates the shared memory of a generational run with pop_size parents and no_of_offspring children
+def create_shared_population(problem, pop_size, no_of_offspring=None):
+    if no_of_offspring is None:
+        no_of_offspring = pop_size
+    pools, pool_fitnesses = allocate_buffers(problem, pop_size, no_of_offspring)
+
+    templates = {'genomes': np.stack(pools), 'fitness': np.stack(pool_fitnesses)}
+    templates.update((key, value) for key, value in problem.items() if isinstance(value, np.ndarray))
+
+    shared = {'blocks': [], 'layout': {}, 'arrays': {}}
+    for name, template in templates.items():
+        block = SharedMemory(create=True, size=max(1, template.nbytes))
+        array = np.ndarray(template.shape, dtype=template.dtype, buffer=block.buf)
+        array[...] = template
+        shared['blocks'].append(block)
+        shared['layout'][name] = (block.name, template.shape, template.dtype.str)
+        shared['arrays'][name] = array
+
+    return shared
+
+
+# the pools and their fitness arrays, as the buffers parameter of run_generational
+def shared_buffers(shared):
+    genomes, fitness = shared['arrays']['genomes'], shared['arrays']['fitness']
+    return [genomes[0], genomes[1]], [fitness[0], fitness[1]]
+
+
+# attaches to the shared memory of the layout, in another process
+def attach_shared_population(layout):
+    shared = {'blocks': [], 'layout': layout, 'arrays': {}}
+    for name, (block_name, shape, dtype) in layout.items():
+        block = SharedMemory(name=block_name)
+        shared['blocks'].append(block)
+        shared['arrays'][name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return shared
+
+
+# closes the blocks - the process which created them also removes them (unlink)
+def close_shared_population(shared, unlink=True):
+    shared['arrays'].clear()
+    for block in shared['blocks']:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+# ------------ Parallel evaluation ------------
+
+# starts no_of_workers evaluator processes for the problem
+# returns the problem to run: its arrays are the shared ones and its evaluation is done by the evaluators,
+# when the population is a part of the shared pools (otherwise it is evaluated as before, in this process)
+# The returned problem holds the processes, so it cannot be sent to other processes.
+def start_evaluators(problem, shared, no_of_workers):
+    # the evaluators receive the problem without its arrays, which they find in the shared memory
+    arrays = {key: shared['arrays'][key] for key, value in problem.items() if isinstance(value, np.ndarray)}
+    worker_problem = {key: value for key, value in problem.items() if key not in arrays}
+
+    # task = (pool, first row, last row + 1) of the region to evaluate, pool -1 stops the evaluators
+    task = RawArray('q', 3)
+    barrier = Barrier(no_of_workers + 1)
+    processes = [Process(target=__evaluator_worker__,
+                         args=(worker_problem, shared['layout'], task, barrier, worker, no_of_workers),
+                         daemon=True)
+                 for worker in range(no_of_workers)]
+    for process in processes:
+        process.start()
+
+    parallel_problem = dict(problem)
+    parallel_problem.update(arrays)
+    parallel_problem.update({'evaluate': shared_evaluate, 'local_evaluate': problem['evaluate'],
+                             'shared': shared, 'evaluators': [processes, task, barrier]})
+    return parallel_problem
+
+
+# the evaluation of a problem returned by start_evaluators
+def shared_evaluate(problem, population, out):
+    shared = problem['shared']
+    location = __locate_rows__(shared['arrays']['genomes'], population)
+    if location is None:
+        problem['local_evaluate'](problem, population, out)
+        return
+
+    processes, task, barrier = problem['evaluators']
+    pool, start = location
+    task[:] = [pool, start, start + len(population)]
+    # the first wait starts the evaluators, the second one waits for all of them to finish
+    barrier.wait()
+    barrier.wait()
+    out[:] = shared['arrays']['fitness'][pool, start:start + len(population)]
+
+
+# stops the evaluators of a problem returned by start_evaluators
+# the problem drops its shared arrays, so the shared population can be closed
+def stop_evaluators(problem):
+    processes, task, barrier = problem.pop('evaluators')
+    task[0] = -1
+    barrier.wait()
+    for process in processes:
+        process.join()
+
+    shared = problem.pop('shared')
+    for key in [key for key, value in problem.items() if isinstance(value, np.ndarray)]:
+        if key in shared['arrays']:
+            del problem[key]
+
+
+# the process of an evaluator: every task it evaluates its equal part of the rows, in place
+def __evaluator_worker__(problem, layout, task, barrier, worker, no_of_workers):
+    shared = attach_shared_population(layout)
+    genomes, fitness = shared['arrays']['genomes'], shared['arrays']['fitness']
+    problem = dict(problem)
+    problem.update((key, value) for key, value in shared['arrays'].items() if key not in ('genomes', 'fitness'))
+
+    try:
+        while True:
+            barrier.wait()
+            pool, start, stop = task[:]
+            if pool < 0:
+                break
+            first = start + (stop - start) * worker // no_of_workers
+            last = start + (stop - start) * (worker + 1) // no_of_workers
+            if last > first:
+                problem['evaluate'](problem, genomes[pool, first:last], fitness[pool, first:last])
+            barrier.wait()
+    except BaseException:
+        # the main process would wait for this evaluator forever, so the barrier is broken
+        barrier.abort()
+        raise
+    finally:
+        del genomes, fitness, problem
+        close_shared_population(shared, unlink=False)
+
+
+# the (pool, first row) of population in the shared genomes, or None if population is not a block of their rows
+def __locate_rows__(genomes, population):
+    offset = population.__array_interface__['data'][0] - genomes.__array_interface__['data'][0]
+    row_size = genomes.strides[1]
+    if (population.dtype != genomes.dtype or population.ndim != 2 or population.shape[1] != genomes.shape[2]
+            or not population.flags['C_CONTIGUOUS'] or offset < 0 or offset % row_size
+            or offset + population.nbytes > genomes.nbytes):
+        return None
+    return divmod(offset // row_size, genomes.shape[1])
+
+
+# Example in Python Console (on the systems which start the processes by spawn, in a script protected by
+# if __name__ == "__main__"):
+# import numpy as np
+# import problems as pr
+# import genetic_algorithm as ga
+# import shared_population as sp
+# problem = pr.tsp_problem(np.genfromtxt("costuri.txt"))
+# shared = sp.create_shared_population(problem, 100)
+# parallel_problem = sp.start_evaluators(problem, shared, 4)
+# best, best_fitness, history = ga.run_generational(parallel_problem, 100, 50, 0.8, 0.2,
+#                                                   buffers=sp.shared_buffers(shared))
+# sp.stop_evaluators(parallel_problem)
+# sp.close_shared_population(shared)
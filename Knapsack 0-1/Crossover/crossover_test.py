@@ -1,6 +1,7 @@
 import matplotlib.pyplot as grafic
 import numpy as np
-from FunctiiCrossoverIndivizi import crossover_uniform
+from FunctiiCrossoverIndivizi import uniform_crossover_population
+from RepairFunctions import ratio_order, repair_binary_population
 
 
 # checks the feasibility of the chosen x and computes the objective function f
@@ -15,6 +16,39 @@ def ok(x,n,c,v,max):
     return cost<=max,val
 
 
+# checks the feasibility and computes the objective function for all the individuals at once
+# I: x - the population as a matrix dimxn, without the values
+# O: the feasibility mask and the array of values
+#
+#verifica fezabilitatea si calculeaza f. obiectiv pentru toti indivizii odata
+#I: x - populatia ca matrice dimxn, fara valori
+#E: vectorul fezabilitatii si vectorul valorilor
+def ok_populatie(x,c,v,max):
+    val=x@v
+    cost=x@c
+    return cost<=max,val
+
+
+# generates dim feasible individuals at once, without rejection:
+# every individual parses the items in a random order and takes each item which still fits in the knapsack
+# O: x - the population as a matrix dimxn with elements 0, 1
+#
+#genereaza dim indivizi fezabili odata, fara respingere:
+#fiecare individ parcurge obiectele intr-o ordine aleatoare si ia fiecare obiect care inca incape in rucsac
+#E: x - populatia ca matrice dimxn cu elemente 0,1
+def populatie_fezabila(dim,n,c,max):
+    x=np.zeros((dim,n),dtype=int)
+    cost=np.zeros(dim)
+    linii=np.arange(dim)
+    ordine=np.argsort(np.random.uniform(0,1,(dim,n)),axis=1)
+    for j in range(n):
+        obiect=ordine[:,j]
+        incape=cost+c[obiect]<=max
+        x[linii[incape],obiect[incape]]=1
+        cost[incape]=cost[incape]+c[obiect[incape]]
+    return x
+
+
 # generate the initial population
 # I: fc, fv - the name of the files cost, value
 #    max - the maximum capacity
@@ -40,31 +74,17 @@ def gen(fc,fv,max,dim):
     #works with the population as a list of dim elements - lists with n+1 individuals
     #
     #lucreaza cu populatia ca lista de dim elemente - liste cu cate n+1 indivizi
-    pop=[]
-    for i in range(dim):
-        gata=False
-        while gata == False:
-            # generates the candidate x with elements 0, 1
-            #
-            #genereaza candidatul x cu elemente 0,1
-            x=np.random.randint(0,2,n)
-            gata,val=ok(x,n,c,v,max)
-        #we have found a feasible candidate solution in type ndarray (array) x
-        # x is transformed in list
-        #
-        #am gasit o solutie candidat fezabila, in data de tip ndarray (vector) x
-        # x este transformat in lista
-        x=list(x)
-        # add the value
-        #
-        # adauga valoarea
-        x=x+[val]
-        # add to the population the new individual with the objective function value
-        # - add another list of n+1 elements as an elements of the list pop
-        #
-        #adauga la populatie noul individ cu valoarea f. obiectiv
-        #- adauga inca o lista cu n+1 elemente ca element al listei pop
-        pop=pop+[x]
+    # generates the feasible candidates x with elements 0, 1 - all at once, without rejection
+    #
+    #genereaza candidatii fezabili x cu elemente 0,1 - toti odata, fara respingere
+    x=populatie_fezabila(dim,n,c,max)
+    fez,val=ok_populatie(x,c,v,max)
+    # add to the population each individual with the objective function value
+    # - a list of n+1 elements as an element of the list pop
+    #
+    #adauga la populatie fiecare individ cu valoarea f. obiectiv
+    #- o lista cu n+1 elemente ca element al listei pop
+    pop=[list(x[i])+[val[i]] for i in range(dim)]
     return pop,dim,n,c,v,max
 
 
@@ -72,6 +92,8 @@ def gen(fc,fv,max,dim):
 # I:    pop,dim,n - the population of dimx(n+1) dimension
 #     c, v, max - as above
 #     pc - crossover probability
+#     ordine - optional, the order of the items by value/cost ratio (ratio_order) - computed here
+#              if missing; it can be computed once and passed to every call
 #E: po - children population
 # asexual recombination is implemented
 #
@@ -79,45 +101,47 @@ def gen(fc,fv,max,dim):
 # I: pop,dim,n - ca mai sus
 #     c, v, max - datele problemei
 #     pc- probabilitatea de crossover
+#     ordine - optional, ordinea obiectelor dupa raportul valoare/cost (ratio_order) -
+#              calculata aici daca lipseste; se poate calcula o singura data si transmite la fiecare apel
 #E: po - populatia copiilor
 # este implementata recombinarea asexuata
-def crossover_populatie(pop,dim,n,c,v,max,pc):
-    po=[]
+def crossover_populatie(pop,dim,n,c,v,max,pc,ordine=None):
+    # the order of the items by value/cost ratio, used by the repair - computed if it is not given
+    #
+    # ordinea obiectelor dupa raportul valoare/cost, folosita la reparare - calculata daca nu este data
+    if ordine is None:
+        ordine=ratio_order(c,v)
+    # asexual recombination - the children are initialized with the parents
+    #
+    # recombinare asexuata - copiii sunt initializati cu parintii
+    po=[pop[i].copy() for i in range(dim)]
     # the individuals are selected 0,1, then 2,3 samd
     #
     #populatia este parcursa astfel incat sunt selectati indivizii 0,1 apoi 2,3 s.a.m.d
-    for i in range(0,dim-1,2):
-        #select parents
+    perechi=np.reshape(np.arange(dim-dim%2),(-1,2))
+    # for every pair randomly generate if the crossover is being made - a single call
+    #
+    # pentru fiecare pereche genereaza aleator daca se face crossover - un singur apel
+    r=np.random.uniform(0,1,len(perechi))
+    perechi=perechi[r<=pc]
+    if len(perechi):
+        #crossover on all selected pairs at once - uniform - more suitable here
         #
-        #selecteaza parintii
-        x = pop[i].copy()
-        y = pop[i+1].copy()
-        r = np.random.uniform(0,1)
-        if r<=pc:
-            #crossover x with y - uniform - more suitable here
-            #
-            # crossover x cu y - uniform: mai potrivit aici
-            c1,c2=crossover_uniform(x[:n] ,y[:n] ,n)
-            fez, val = ok(c1, n, c, v, max)
-            if fez:
-               c1=c1+[val]
-            else:
-                c1 = x.copy()
-            fez, val = ok(c2, n, c, v, max)
-            if fez:
-               c2=c2+[val]
-            else:
-                c2 = y.copy()
-        else:
-            # asexual recombination
-            # recombinare asexuata
-            c1 = x.copy()
-            c2 = y.copy()
-        #copy the results in children population
+        # crossover pe toate perechile selectate odata - uniform: mai potrivit aici
+        x=np.array([pop[i][:n] for i in range(dim)])
+        copii=uniform_crossover_population(x,perechi)
+        # the infeasible children are repaired instead of being discarded, by removing the items
+        # with the smallest value/cost ratio until they fit in the knapsack
         #
-        #copiaza rezultatul in populatia urmasilor
-        po = po+[c1]
-        po = po+[c2]
+        # copiii nefezabili sunt reparati in loc sa fie eliminati, prin eliminarea obiectelor
+        # cu cel mai mic raport valoare/cost pana cand incap in rucsac
+        copii=repair_binary_population(copii,c,max,ordine)
+        val = ok_populatie(copii, c, v, max)[1]
+        for k,i in enumerate(perechi.ravel()):
+            # after the repair every child is feasible, so it always replaces its parent
+            #
+            # dupa reparare fiecare copil este fezabil, deci inlocuieste intotdeauna parintele sau
+            po[i]=copii[k].tolist()+[val[k]]
     valorip=[pop[i][n] for i in range(dim)]
     valoric=[po[i][n] for i in range (dim)]
     figureaza(valorip,valoric, dim)
@@ -0,0 +1,122 @@
+import numpy as np
+
+
+# ------------ Bit-packed representation for the Knapsack 0-1 ------------
+
+# The population is kept as an ndarray (pop_size, no_of_words) of uint64:
+# gene i of an individual is bit i % 64 of word i // 64, the bits after the last gene are always 0.
+# A 10000 genes individual needs 157 words (1256 bytes) instead of a list of 10000 python ints.
+# The dimension of the problem n is not stored in the words, so it is passed to the functions
+# (as the drivers already do).
+
+# the number of genes in a chunk of the population which is unpacked at once
+CHUNK_GENES = 1 << 22
+
+
+# transforms a 0/1 population matrix (pop_size, n) into the packed representation
+def pack_population(population):
+    population = np.asarray(population)
+    pop_size, n = population.shape
+    no_of_words = (n + 63) // 64
+
+    packed_bytes = np.zeros((pop_size, 8 * no_of_words), dtype=np.uint8)
+    packed_bytes[:, :(n + 7) // 8] = np.packbits(population != 0, axis=1, bitorder='little')
+
+    return packed_bytes.view('<u8')
+
+
+# transforms the packed population back into a 0/1 matrix (pop_size, n) of uint8
+def unpack_population(packed, n):
+    packed_bytes = np.ascontiguousarray(packed).view(np.uint8)
+    return np.unpackbits(packed_bytes, axis=1, count=n, bitorder='little')
+
+
+# uniform crossover on the packed population
+# pairs - ndarray (k, 2) with the indexes of the lines which are recombined
+# returns the packed children (2k, no_of_words): lines 2i and 2i + 1 are the children of (pairs[i, 0], pairs[i, 1])
+def uniform_crossover_packed(packed, pairs):
+    pairs = np.asarray(pairs)
+    parents_1 = packed[pairs[:, 0]]
+    parents_2 = packed[pairs[:, 1]]
+
+    # a random bit for each gene - the genes where the bit is 1 are exchanged
+    # the bits after the last gene are 0 in both parents, so they stay 0
+    no_of_pairs, no_of_words = parents_1.shape
+    mask = np.random.randint(0, 256, (no_of_pairs, 8 * no_of_words), dtype=np.uint8).view('<u8')
+    exchanged = (parents_1 ^ parents_2) & mask
+
+    children = np.empty((2 * no_of_pairs, no_of_words), dtype=packed.dtype)
+    children[0::2] = parents_1 ^ exchanged
+    children[1::2] = parents_2 ^ exchanged
+
+    return children
+
+
+# bit flip mutation on the packed population - every gene is flipped with probability pm
+# the flipped bits are XOR-ed directly into the words, the population is never unpacked
+# returns the mutated copy of the population
+def bit_flip_mutation_packed(packed, n, pm):
+    pop_size = len(packed)
+    mutated = packed.copy()
+
+    # the positions are generated on chunks of lines, to bound the memory of the random numbers
+    chunk = max(1, CHUNK_GENES // max(n, 1))
+    for start in range(0, pop_size, chunk):
+        stop = min(start + chunk, pop_size)
+        positions = __flip_positions__((stop - start) * n, pm)
+        rows, genes = positions // n, positions % n
+        bits = np.left_shift(np.uint64(1), (genes % 64).astype(np.uint64))
+        # several flipped genes can fall in the same word, so the XOR is accumulated with .at
+        np.bitwise_xor.at(mutated, (start + rows, genes // 64), bits)
+
+    return mutated
+
+
+# computes the cost and the value of every individual directly from the packed words
+# costs, values - the data of the problem, arrays of size n
+# returns (total_cost, total_value), arrays of size pop_size
+def packed_cost_value(packed, n, costs, values):
+    packed_bytes = np.ascontiguousarray(packed).view(np.uint8)
+    pop_size, no_of_bytes = packed_bytes.shape
+    byte_positions = np.arange(no_of_bytes)
+
+    cost_table = __byte_table__(costs, n, no_of_bytes)
+    value_table = __byte_table__(values, n, no_of_bytes)
+
+    # every byte of an individual contributes the sum of the items of its set bits
+    # the lines are parsed in chunks, so the looked up values take about as much memory as CHUNK_GENES bits
+    total_cost = np.zeros(pop_size, dtype=float)
+    total_value = np.zeros(pop_size, dtype=float)
+    chunk = max(1, CHUNK_GENES // max(8 * no_of_bytes, 1))
+    for start in range(0, pop_size, chunk):
+        chunk_bytes = packed_bytes[start:start + chunk]
+        total_cost[start:start + chunk] = cost_table[byte_positions, chunk_bytes].sum(axis=1)
+        total_value[start:start + chunk] = value_table[byte_positions, chunk_bytes].sum(axis=1)
+
+    return total_cost, total_value
+
+
+# the positions of the flipped genes among no_of_genes genes: the distance between two consecutive flipped genes
+# follows a geometric distribution, so only about no_of_genes * pm random numbers are drawn
+# (as MutationFunctions.mutation_positions)
+def __flip_positions__(no_of_genes, pm):
+    if pm <= 0 or no_of_genes == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    pm = min(pm, 1)
+    expected = no_of_genes * pm
+    batch = int(expected + 5 * np.sqrt(expected)) + 16
+    jumps = np.random.geometric(pm, batch)
+    while jumps.sum() < no_of_genes:
+        jumps = np.concatenate((jumps, np.random.geometric(pm, batch)))
+    positions = np.cumsum(jumps) - 1
+    return positions[positions < no_of_genes]
+
+
+# table[j, b] = the sum of the items 8j...8j+7 which are selected by the bits of the byte b
+def __byte_table__(items, n, no_of_bytes):
+    padded_items = np.zeros(8 * no_of_bytes, dtype=float)
+    padded_items[:n] = items
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder='little')
+
+    return padded_items.reshape(no_of_bytes, 8) @ bits.T
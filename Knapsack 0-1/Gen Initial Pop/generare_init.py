@@ -23,6 +23,37 @@ def compute_quality(candidate, values):
     return total_value
 
 
+# evaluate the whole population at once (works for 0-1 and for real valued candidates)
+# population - matrix (population_size, individual_size), without the quality column
+# returns the arrays of total costs and total values and the feasibility mask
+def evaluate_population(population, costs, values, max_capacity):
+    population = np.asarray(population, dtype=float)
+    total_costs = population @ costs
+    total_values = population @ values
+    return total_costs, total_values, total_costs <= max_capacity
+
+
+# generate population_size feasible candidates at once, without rejection
+# every candidate parses the items in a random order and takes each item which still fits in the knapsack,
+# so the generation always ends after individual_size steps, however small max_capacity is
+def generate_feasible_population(population_size, costs, max_capacity):
+    individual_size = len(costs)
+    population = np.zeros((population_size, individual_size), dtype=int)
+    total_costs = np.zeros(population_size)
+    lines = np.arange(population_size)
+
+    # a random order of the items for each candidate
+    order = np.argsort(np.random.uniform(0, 1, (population_size, individual_size)), axis=1)
+
+    for j in range(individual_size):
+        item = order[:, j]
+        fits = total_costs + costs[item] <= max_capacity
+        population[lines[fits], item[fits]] = 1
+        total_costs[fits] += costs[item[fits]]
+
+    return population
+
+
 # population representation by points (individual index, quality) - to see the variability in the population
 def draw_pop(population):
     population_size = len(population)
@@ -48,28 +79,15 @@ def generate_initial_population(costs_file, values_file, max_capacity, populatio
     costs = read_from_file(costs_file)
     values = read_from_file(values_file)
 
-    # individual_size = the dimension of the problem
-    individual_size = len(costs)
-
-    # works with the population as the list with dim elements - lists with individual_size+1 individuals
-    population = []
+    # generate the feasible candidates with elements 0, 1
+    candidates = generate_feasible_population(population_size, costs, max_capacity)
 
-    for i in range(population_size):
-        done = False
-        candidate = None
-        while not done:
-            # generate the candidate with elements 0, 1
-            candidate = np.random.randint(0, 2, individual_size).tolist()
-            done = check_feasible(candidate, costs, max_capacity)
+    # compute the quality of the feasible candidates
+    total_costs, qualities, feasible = evaluate_population(candidates, costs, values, max_capacity)
 
-        # compute the quality of the feasible candidate
-        quality = compute_quality(candidate, values)
-
-        # add the quality
-        candidate.append(quality)
-
-        # add the candidate to the population
-        population += [candidate]
+    # works with the population as the list with dim elements - lists with individual_size+1 individuals
+    # each candidate has the quality added on the last position
+    population = [candidates[i].tolist() + [qualities[i]] for i in range(population_size)]
 
     draw_pop(population)
     return population
@@ -1,5 +1,6 @@
 import numpy as np
-from FunctiiMutatieIndivizi import m_binar
+from KnapsackFunctions import bit_flip_mutation_tracked, repair_binary_tracked
+from RepairFunctions import ratio_order
 import matplotlib.pyplot as grafic
 
 #checks the feasibility of the chosen x and computes the objective function f
@@ -14,6 +15,39 @@ def ok(x,n,c,v,max):
     return cost<=max,val
 
 
+# checks the feasibility and computes the objective function for all the individuals at once
+# I: x - the population as a matrix dimxn, without the values
+# O: the feasibility mask and the array of values
+#
+#verifica fezabilitatea si calculeaza f. obiectiv pentru toti indivizii odata
+#I: x - populatia ca matrice dimxn, fara valori
+#E: vectorul fezabilitatii si vectorul valorilor
+def ok_populatie(x,c,v,max):
+    val=x@v
+    cost=x@c
+    return cost<=max,val
+
+
+# generates dim feasible individuals at once, without rejection:
+# every individual parses the items in a random order and takes each item which still fits in the knapsack
+# O: x - the population as a matrix dimxn with elements 0, 1
+#
+#genereaza dim indivizi fezabili odata, fara respingere:
+#fiecare individ parcurge obiectele intr-o ordine aleatoare si ia fiecare obiect care inca incape in rucsac
+#E: x - populatia ca matrice dimxn cu elemente 0,1
+def populatie_fezabila(dim,n,c,max):
+    x=np.zeros((dim,n),dtype=int)
+    cost=np.zeros(dim)
+    linii=np.arange(dim)
+    ordine=np.argsort(np.random.uniform(0,1,(dim,n)),axis=1)
+    for j in range(n):
+        obiect=ordine[:,j]
+        incape=cost+c[obiect]<=max
+        x[linii[incape],obiect[incape]]=1
+        cost[incape]=cost[incape]+c[obiect[incape]]
+    return x
+
+
 # generate the initial population
 # I: fc, fv - the name of the files cost, value
 #    max - the maximum capacity
@@ -39,30 +73,17 @@ def gen(fc,fv,max,dim):
     # works with the population as a list of dim elements - lists with n+1 individuals
     #
     #lucreaza cu populatia ca lista de dim elemente - liste cu cate n+1 indivizi
-    pop=[]
-    for i in range(dim):
-        gata=False
-        while gata == False:
-            # generates the candidate x with elements 0, 1
-            #
-            #genereaza candidatul x cu elemente 0,1
-            x=np.random.randint(0,2,n)
-            gata,val=ok(x,n,c,v,max)
-
-        # we have found a feasible candidate solution, of type ndarray (array) x
-        # x is transformed in list
-        #
-        #am gasit o solutie candidat fezabila, in data de tip ndarray (vector) x
-        # x este transformat in lista
-        x=list(x)
-        # add the value
-        #
-        # adauga valoarea
-        x=x+[val]
-        # add to the population the new individual with the objective function value - add another list of n+1 elements as an elements of the list pop
-        #
-        #adauga la populatie noul individ cu valoarea f. obiectiv - adauga inca o lista cu n+1 elemente ca element al listei pop
-        pop=pop+[x]
+    # generates the feasible candidates x with elements 0, 1 - all at once, without rejection
+    #
+    #genereaza candidatii fezabili x cu elemente 0,1 - toti odata, fara respingere
+    x=populatie_fezabila(dim,n,c,max)
+    fez,val=ok_populatie(x,c,v,max)
+    # add to the population each individual with the objective function value
+    # - a list of n+1 elements as an element of the list pop
+    #
+    #adauga la populatie fiecare individ cu valoarea f. obiectiv
+    #- o lista cu n+1 elemente ca element al listei pop
+    pop=[list(x[i])+[val[i]] for i in range(dim)]
     ind = [i for i in range(dim)]
     vect = [pop[i][n] for i in range(dim)]
     grafic.plot(ind, vect, "gs", markersize=12)
@@ -71,42 +92,54 @@ def gen(fc,fv,max,dim):
 
 # mutation on the population of children
 # I:    pop,dim,n - the population of dimensions dimx(n+1)
+#       c, v, max - the data of the problem, as returned by gen
 #       pm - the mutation probability
+#       ordine - optional, the order of the items by value/cost ratio (ratio_order) - computed here
+#                if missing; it can be computed once and passed to every call
 # O:    mpop - the mutated population
 #
 #mutatie asupra populatiei de copii
 # I:pop,dim,n - populatia de dimensiuni dimx(n+1)
+#   c, v, max - datele problemei, asa cum sunt returnate de gen
 #   pm - probabilitatea de mutatie
+#   ordine - optional, ordinea obiectelor dupa raportul valoare/cost (ratio_order) -
+#            calculata aici daca lipseste; se poate calcula o singura data si transmite la fiecare apel
 #E: - mpop - populatia mutata
-def mutatie_populatie(pop,dim,n,c,v,max,pm):
+def mutatie_populatie(pop,dim,n,c,v,max,pm,ordine=None):
+    # the order of the items by value/cost ratio, used by the repair - computed if it is not given
+    #
+    # ordinea obiectelor dupa raportul valoare/cost, folosita la reparare - calculata daca nu este data
+    if ordine is None:
+        ordine=ratio_order(c,v)
     # we copy the population in the result variable
     #
     #copiem populatia in rezultat
     mpop=pop.copy()
-    for i in range(dim):
-        # we copy in x the individual i from the input population
-        #
-        #copiem in x individul i din populatia intrare
-        x=pop[i][:n].copy()
-        for j in range(n):
-            # randomly generate if the mutation in the individual i, gene j is being made
-            #
-            #genereaza aleator daca se face mutatie in individul i gena j
-            r=np.random.uniform(0,1)
-            if r<=pm:
-                # mutation
-                #
-                #mutatie
-                x[j]=m_binar(x[j])
+    mx=np.array([pop[i][:n] for i in range(dim)])
+    # the running totals of the individuals: the value is the last element of every individual,
+    # the cost is computed once; then only the mutated and the repaired genes update them
+    #
+    # totalurile curente ale indivizilor: valoarea este ultimul element al fiecarui individ,
+    # costul este calculat o singura data; apoi doar genele mutate si reparate le actualizeaza
+    val=np.array([pop[i][n] for i in range(dim)],dtype=float)
+    cost=mx@c
+    # mutation on all the genes of all the individuals - every gene is mutated with probability pm
+    #
+    #mutatie pe toate genele tuturor indivizilor - fiecare gena sufera mutatie cu probabilitatea pm
+    mutat=bit_flip_mutation_tracked(mx,cost,val,c,v,pm)
+    # the infeasible individuals are repaired instead of being discarded, by removing the items
+    # with the smallest value/cost ratio until they fit in the knapsack - only they are read again
+    #
+    # indivizii nefezabili sunt reparati in loc sa fie eliminati, prin eliminarea obiectelor
+    # cu cel mai mic raport valoare/cost pana cand incap in rucsac - doar ei sunt parcursi din nou
+    repair_binary_tracked(mx,cost,val,c,v,max,ordine)
+    for i in np.nonzero(mutat)[0]:
         # the resulted individual can possibly suffer multiple mutations
-        # if it is feasible, it is preserved
+        # after the repair it is always feasible, so it is preserved
         #
         #individul rezultat sufera posibil mai multe mutatii
-        #daca este fezabil, este pastrat
-        fez, val = ok(x, n, c, v, max)
-        if fez:
-            x=x+[val]
-            mpop[i]=x.copy()
+        #dupa reparare este intotdeauna fezabil, deci este pastrat
+        mpop[i]=mx[i].tolist()+[val[i]]
     ind = [i for i in range(dim)]
     vect = [mpop[i][n] for i in range(dim)]
     grafic.plot(ind, vect, "rs", markersize=9)
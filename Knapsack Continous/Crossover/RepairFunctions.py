@@ -0,0 +1,85 @@
+import numpy as np
+
+
+# ------------ Repair of infeasible knapsack individuals ------------
+
+# Instead of discarding an infeasible child, the child is repaired: the items with the smallest
+# value / cost ratio are removed (0-1) or reduced (real values) until the cost fits in the knapsack.
+# Optionally, the free capacity is then filled again, starting with the items with the largest ratio.
+# The functions work on the whole population matrix (pop_size, n) at once and return the repaired population;
+# the individuals which are already feasible are not removed from, only (optionally) refilled.
+# out - optional ndarray (pop_size, n) in which the repaired population is written (a copy is returned,
+#       if missing) - it can be population itself, for a repair in place
+
+
+# the order of the items by value / cost ratio, from the smallest to the largest - computed once for a problem
+def ratio_order(costs, values):
+    costs = np.asarray(costs, dtype=float)
+    ratios = np.asarray(values, dtype=float) / np.maximum(costs, np.finfo(float).tiny)
+    return np.argsort(ratios, kind="stable")
+
+
+# repair of a 0-1 population
+def repair_binary_population(population, costs, max_capacity, order, refill=False, out=None):
+    costs = np.asarray(costs, dtype=float)
+    repaired = __repair_result__(population, out)
+
+    # the items in the order of their ratio and their costs in the individuals
+    sorted_items = repaired[:, order]
+    sorted_costs = sorted_items * costs[order]
+    excess = sorted_costs.sum(axis=1) - max_capacity
+
+    # an item is removed while the items removed before it (with smaller ratio) do not cover the excess
+    removed_before = np.cumsum(sorted_costs, axis=1) - sorted_costs
+    removed = (sorted_items != 0) & (removed_before < excess[:, None])
+    sorted_items[removed] = 0
+    repaired[:, order] = sorted_items
+
+    if refill:
+        # the items which still fit are added, starting with the largest ratio
+        total_costs = repaired @ costs
+        for item in order[::-1]:
+            fits = (repaired[:, item] == 0) & (total_costs + costs[item] <= max_capacity)
+            repaired[fits, item] = 1
+            total_costs[fits] += costs[item]
+
+    return repaired
+
+
+# repair of a population with real values in [0, upper_limit]
+def repair_real_population(population, costs, max_capacity, order, refill=False, upper_limit=1, out=None):
+    costs = np.asarray(costs, dtype=float)
+    repaired = __repair_result__(population, out, float)
+    # a slightly smaller capacity, so that the rounded cost of a repaired individual still fits
+    max_capacity = (1 - 1e-12) * max_capacity
+
+    # the genes in the order of their ratio and the cost each of them takes
+    sorted_genes = repaired[:, order]
+    sorted_costs = sorted_genes * costs[order]
+    excess = sorted_costs.sum(axis=1) - max_capacity
+
+    # the genes are reduced to 0 while the genes reduced before them do not cover the excess;
+    # the gene which covers it is reduced only with what is left of the excess
+    removed_before = np.cumsum(sorted_costs, axis=1) - sorted_costs
+    reduction = np.clip(excess[:, None] - removed_before, 0, sorted_costs)
+    sorted_genes -= reduction / np.maximum(costs[order], np.finfo(float).tiny)
+
+    if refill:
+        # the free capacity is given to the genes with the largest ratio, each of them up to upper_limit
+        free_capacity = max_capacity - (sorted_genes * costs[order]).sum(axis=1)
+        addable_costs = ((upper_limit - sorted_genes) * costs[order])[:, ::-1]
+        added_before = np.cumsum(addable_costs, axis=1) - addable_costs
+        addition = np.clip(free_capacity[:, None] - added_before, 0, addable_costs)[:, ::-1]
+        sorted_genes += addition / np.maximum(costs[order], np.finfo(float).tiny)
+
+    repaired[:, order] = np.clip(sorted_genes, 0, upper_limit)
+    return repaired
+
+
+# the array in which the repaired population is written: a copy of population or out
+def __repair_result__(population, out, dtype=None):
+    if out is None:
+        return np.array(population, dtype=dtype)
+    if out is not population:
+        out[...] = population
+    return out
@@ -1,5 +1,6 @@
 import numpy as np
-from FunctiiCrossoverIndivizi import crossover_singular, crossover_simplu, crossover_uniform
+from FunctiiCrossoverIndivizi import single_arithmetic_crossover_population, simple_arithmetic_crossover_population, uniform_crossover_population
+from RepairFunctions import ratio_order, repair_real_population
 import matplotlib.pyplot as grafic
 #for legend
 #pentru legenda
@@ -17,6 +18,44 @@ def ok(x,n,c,v,max):
     return cost<=max,val
 
 
+# checks the feasibility and computes the objective function for all the individuals at once
+# I: x - the population as a matrix dimxn, without the values
+# O: the feasibility mask and the array of values
+#
+#verifica fezabilitatea si calculeaza f. obiectiv pentru toti indivizii odata
+#I: x - populatia ca matrice dimxn, fara valori
+#E: vectorul fezabilitatii si vectorul valorilor
+def ok_populatie(x,c,v,max):
+    val=x@v
+    cost=x@c
+    return cost<=max,val
+
+
+# generates dim feasible individuals at once, without rejection:
+# the candidates are sampled in [0,1]^n and each candidate whose cost exceeds max is scaled down to cost max
+# lhs - if True, the candidates are sampled by latin hypercube: on every item, each of the dim intervals
+#       [k/dim, (k+1)/dim) receives exactly one candidate, so the population covers [0,1] evenly
+# O: x - the population as a matrix dimxn with elements from [0,1]
+#
+#genereaza dim indivizi fezabili odata, fara respingere:
+#candidatii sunt generati in [0,1]^n si fiecare candidat cu costul peste max este scalat pana la costul max
+#lhs - daca este True, candidatii sunt generati prin hipercub latin: pe fiecare obiect, fiecare dintre cele dim
+#      intervale [k/dim, (k+1)/dim) primeste exact un candidat, deci populatia acopera uniform [0,1]
+#E: x - populatia ca matrice dimxn cu elemente din [0,1]
+def populatie_fezabila(dim,n,c,max,lhs=False):
+    if lhs:
+        intervale=np.argsort(np.random.uniform(0,1,(dim,n)),axis=0)
+        x=(intervale+np.random.uniform(0,1,(dim,n)))/dim
+    else:
+        x=np.random.uniform(0,1,(dim,n))
+    cost=x@c
+    #the factor is slightly below max/cost, so that the rounded cost stays <= max
+    #
+    #factorul este putin sub max/cost, pentru ca si costul rotunjit sa ramana <= max
+    factor=np.minimum(1,(1-1e-12)*max/np.maximum(cost,np.finfo(float).tiny))
+    return x*factor[:,None]
+
+
 # generate the initial population
 # I: fc, fv - the name of the files cost, value
 #    max - the maximum capacity
@@ -45,31 +84,17 @@ def gen(fc,fv,max,dim):
     #works with the population as a list of dim elements - lists with n+1 individuals
     #
     #lucreaza cu populatia ca lista de dim elemente - liste cu cate n+1 indivizi
-    pop=[]
-    for i in range(dim):
-        gata=False
-        while gata == False:
-            #generates the candidate x with elements from [0,1]
-            #
-            #genereaza candidatul x cu elemente pe [0,1]
-            x=np.random.uniform(0,1,n)
-            gata,val=ok(x,n,c,v,max)
-        # we have found a feasible candidate solution in type ndarray (array) x
-        # x is transformed in list
-        #
-        #am gasit o solutie candidat fezabila, in data de tip ndarray (vector) x
-        # x este transformat in lista
-        x=list(x)
-        #add the value
-        #
-        # adauga valoarea
-        x=x+[val]
-        # add to the population the new individual with the objective function value
-        # - add another list of n+1 elements as an elements of the list pop
-        #
-        #adauga la populatie noul individ cu valoarea f. obiectiv
-        # - adauga inca o lista cu n+1 elemente ca element al listei pop
-        pop=pop+[x]
+    # generates the feasible candidates x with elements from [0,1] - all at once, without rejection
+    #
+    #genereaza candidatii fezabili x cu elemente pe [0,1] - toti odata, fara respingere
+    x=populatie_fezabila(dim,n,c,max)
+    fez,val=ok_populatie(x,c,v,max)
+    # add to the population each individual with the objective function value
+    # - a list of n+1 elements as an element of the list pop
+    #
+    #adauga la populatie fiecare individ cu valoarea f. obiectiv
+    #- o lista cu n+1 elemente ca element al listei pop
+    pop=[list(x[i])+[val[i]] for i in range(dim)]
     return pop, dim, n, c, v, max
 
 def figureaza(p,rez,dim,n):
@@ -92,6 +117,8 @@ def figureaza(p,rez,dim,n):
 #     c, v, max - as above
 #     pc - crossover probability
 #     alpha - weight in simple / singular arithmetic recombination
+#     ordine - optional, the order of the items by value/cost ratio (ratio_order) - computed here
+#              if missing; it can be computed once and passed to every call
 #ATTENTION - the objective function is linear - we do not use whole arithmetic mean
 #E: po - children population
 # asexual recombination is implemented
@@ -101,36 +128,47 @@ def figureaza(p,rez,dim,n):
 #     c, v, max - datele problemei
 #     pc- probabilitatea de crossover
 #     alpha - ponderea la recombinarea aritmetica simpla/singulara
+#     ordine - optional, ordinea obiectelor dupa raportul valoare/cost (ratio_order) -
+#              calculata aici daca lipseste; se poate calcula o singura data si transmite la fiecare apel
 # ATENTIE - functia obiectiv este liniara - nu folosim medie aritmetica totala
 #E: po - populatia copiilor
 # este implementata recombinarea asexuata
-def crossover_populatie(pop,dim,n,c,v,max,pc,alpha):
+def crossover_populatie(pop,dim,n,c,v,max,pc,alpha,ordine=None):
+    # the order of the items by value/cost ratio, used by the repair - computed if it is not given
+    #
+    # ordinea obiectelor dupa raportul valoare/cost, folosita la reparare - calculata daca nu este data
+    if ordine is None:
+        ordine=ratio_order(c,v)
     po=pop.copy()
     #the individuals are selected 0,1, then 2,3 samd
     #
     #populatia este parcursa astfel incat sunt selectati indivizii 0,1 apoi 2,3 s.a.m.d
-    for i in range(0,dim-1,2):
-        #select parents
+    perechi=np.reshape(np.arange(dim-dim%2),(-1,2))
+    # for every pair randomly generate if the crossover is being made - a single call
+    #
+    # pentru fiecare pereche genereaza aleator daca se face crossover - un singur apel
+    r=np.random.uniform(0,1,len(perechi))
+    perechi=perechi[r<=pc]
+    if len(perechi):
+        x=np.array([pop[i][:n] for i in range(dim)])
+        # crossover on all selected pairs at once - uniform: inherited from the operator implemented in discrete representations
+        #copii=uniform_crossover_population(x,perechi)
+        # crossover on all selected pairs at once - single arithmetic
+        copii=single_arithmetic_crossover_population(x,perechi,alpha)
+        # crossover on all selected pairs at once - simple arithmetic
+        #copii=simple_arithmetic_crossover_population(x,perechi,alpha)
+        # the infeasible children are repaired instead of being discarded, by reducing the genes
+        # with the smallest value/cost ratio until they fit in the knapsack
+        #
+        # copiii nefezabili sunt reparati in loc sa fie eliminati, prin reducerea genelor
+        # cu cel mai mic raport valoare/cost pana cand incap in rucsac
+        copii=repair_real_population(copii,c,max,ordine)
+        val = ok_populatie(copii, c, v, max)[1]
+        # after the repair every child is feasible, so it always replaces its parent
         #
-        #selecteaza parintii
-        x = pop[i]
-        y = pop[i+1]
-        r = np.random.uniform(0,1)
-        if r<=pc:
-            # crossover x with y - uniform: inherited from the operator implemented in discrete representations
-            #c1,c2=crossover_uniform(x[:n],y[:n],n)
-            # crossover x with y - single arithmetic
-            c1,c2 = crossover_singular(x[:n] ,y[:n] ,n,alpha)
-            # crossover x with y - simple arithmetic
-            #c1,c2 = crossover_simplu(x[:n],y[:n],n,alpha)
-            fez, val = ok(c1, n, c, v, max)
-            if fez:
-                c1=c1+[val]
-                po[i]=c1.copy()
-            fez, val = ok(c2, n, c, v, max)
-            if fez:
-                c2=c2+[val]
-                po[i+1]=c2.copy()
+        # dupa reparare fiecare copil este fezabil, deci inlocuieste intotdeauna parintele sau
+        for k,i in enumerate(perechi.ravel()):
+            po[i]=copii[k].tolist()+[val[k]]
     figureaza(pop, po, dim, n)
     return po
 
@@ -23,6 +23,38 @@ def compute_quality(candidate, values):
     return total_value
 
 
+# evaluate the whole population at once (works for 0-1 and for real valued candidates)
+# population - matrix (population_size, individual_size), without the quality column
+# returns the arrays of total costs and total values and the feasibility mask
+def evaluate_population(population, costs, values, max_capacity):
+    population = np.asarray(population, dtype=float)
+    total_costs = population @ costs
+    total_values = population @ values
+    return total_costs, total_values, total_costs <= max_capacity
+
+
+# generate population_size feasible candidates at once, without rejection
+# the candidates are sampled in [0,1]^n and every candidate which costs more than max_capacity is scaled down
+# onto the capacity constraint, so the generation is one pass, however small max_capacity is
+# latin_hypercube - if True, on every item each of the intervals [k/population_size, (k+1)/population_size)
+#                   receives exactly one candidate, for a more diverse population
+def generate_feasible_population(population_size, costs, max_capacity, latin_hypercube=False):
+    individual_size = len(costs)
+
+    if latin_hypercube:
+        strata = np.argsort(np.random.uniform(0, 1, (population_size, individual_size)), axis=0)
+        population = (strata + np.random.uniform(0, 1, (population_size, individual_size))) / population_size
+    else:
+        population = np.random.uniform(0, 1, (population_size, individual_size))
+
+    # the scale factor is 1 for the feasible candidates and (just below) max_capacity / cost for the others,
+    # so that the rounded cost of a scaled candidate is still under max_capacity
+    total_costs = population @ costs
+    scale = np.minimum(1, (1 - 1e-12) * max_capacity / np.maximum(total_costs, np.finfo(float).tiny))
+
+    return population * scale[:, None]
+
+
 # population representation by points (individual index, quality) - to see the variability in the population
 def draw_pop(population):
     population_size = len(population)
@@ -48,28 +80,15 @@ def generate_initial_population(costs_file, values_file, max_capacity, populatio
     costs = read_from_file(costs_file)
     values = read_from_file(values_file)
 
-    # individual_size = the dimension of the problem
-    individual_size = len(costs)
-
-    # works with the population as the list with dim elements - lists with individual_size+1 individuals
-    population = []
+    # generate the feasible candidates with elements from [0, 1]
+    candidates = generate_feasible_population(population_size, costs, max_capacity)
 
-    for i in range(population_size):
-        done = False
-        candidate = None
-        while not done:
-            # generate the candidate with elements 0, 1
-            candidate = np.random.uniform(0, 1, individual_size).tolist()
-            done = check_feasible(candidate, costs, max_capacity)
+    # compute the quality of the feasible candidates
+    total_costs, qualities, feasible = evaluate_population(candidates, costs, values, max_capacity)
 
-        # compute the quality of the feasible candidate
-        quality = compute_quality(candidate, values)
-
-        # add the quality
-        candidate.append(quality)
-
-        # add the candidate to the population
-        population += [candidate]
+    # works with the population as the list with dim elements - lists with individual_size+1 individuals
+    # each candidate has the quality added on the last position
+    population = [candidates[i].tolist() + [qualities[i]] for i in range(population_size)]
 
     draw_pop(population)
     return population
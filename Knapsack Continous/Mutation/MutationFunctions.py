@@ -56,6 +56,77 @@ def non_uniform_mutation(initial_value, max_creep_value, lower_limit, upper_limi
     return mutation_result
 
 
+# ------------ Whole population mutation ------------
+
+# The following operators mutate a whole population matrix (pop_size, n) at once:
+# every gene is mutated with probability pm, independently, as in the mutatie_populatie drivers.
+# Instead of one np.random.uniform(0, 1) call for each gene, the mutated positions are drawn together.
+# out - optional ndarray (pop_size, n) in which the mutated population is written (ex. the buffer of the next
+#       generation) - it can be population itself, for a mutation in place; they return the mutated population
+
+# below this probability the positions are found by jumping from one mutated gene to the next
+GEOMETRIC_SKIP_PM = 0.05
+
+
+# the positions (rows, columns) of the mutated genes in a population (pop_size, n)
+def mutation_positions(pop_size, n, pm):
+    no_of_genes = pop_size * n
+
+    if pm <= 0 or no_of_genes == 0:
+        positions = np.zeros(0, dtype=int)
+    elif pm < GEOMETRIC_SKIP_PM:
+        # the distance between two consecutive mutated genes follows a geometric distribution,
+        # so we only draw as many numbers as there are mutations (about no_of_genes * pm)
+        expected = no_of_genes * pm
+        batch = int(expected + 5 * np.sqrt(expected)) + 16
+        jumps = np.random.geometric(pm, batch)
+        while jumps.sum() < no_of_genes:
+            jumps = np.concatenate((jumps, np.random.geometric(pm, batch)))
+        positions = np.cumsum(jumps) - 1
+        positions = positions[positions < no_of_genes]
+    else:
+        # one random number for each gene, drawn with a single call
+        positions = np.flatnonzero(np.random.uniform(0, 1, no_of_genes) <= pm)
+
+    return positions // n, positions % n
+
+
+# bit flip mutation on a 0/1 population
+def bit_flip_mutation_population(population, pm, out=None):
+    mutation_result = __mutation_result__(population, out)
+    rows, columns = mutation_positions(*mutation_result.shape, pm)
+    mutation_result[rows, columns] = 1 - mutation_result[rows, columns]
+    return mutation_result
+
+
+# uniform mutation on a real valued population - resets the mutated values in [lower_limit, upper_limit)
+def uniform_mutation_population(population, pm, lower_limit, upper_limit, out=None):
+    mutation_result = __mutation_result__(population, out, float)
+    rows, columns = mutation_positions(*mutation_result.shape, pm)
+    mutation_result[rows, columns] = np.random.uniform(lower_limit, upper_limit, len(rows))
+    return mutation_result
+
+
+# non-uniform mutation on a real valued population - adds gaussian noise to the mutated values
+# max_creep_value is the standard deviation of the noise
+def non_uniform_mutation_population(population, pm, max_creep_value, lower_limit, upper_limit, out=None):
+    mutation_result = __mutation_result__(population, out, float)
+    rows, columns = mutation_positions(*mutation_result.shape, pm)
+    random_factor = np.random.normal(0, max_creep_value, len(rows))
+    mutation_result[rows, columns] = np.clip(mutation_result[rows, columns] + random_factor,
+                                             lower_limit, upper_limit)
+    return mutation_result
+
+
+# the array in which a population operator writes its result: a copy of population or out
+def __mutation_result__(population, out, dtype=None):
+    if out is None:
+        return np.array(population, dtype=dtype)
+    if out is not population:
+        out[...] = population
+    return out
+
+
 # ------------ Permutations ------------
 
 # Inversion Mutation - reverses a randomly selected portion of the permutation
@@ -80,11 +151,31 @@ def inversion_mutation(initial_permutation):
     mutation_result = initial_permutation.copy()
 
     # And reverse the segment denoted by poz_1 and poz_2
-    mutation_result[poz_1:poz_2 + 1] = initial_permutation[poz_2:poz_1 - 1:-1]
+    # (the segment is reversed after slicing, because for poz_1 = 0 the index poz_1 - 1 would be -1)
+    mutation_result[poz_1:poz_2 + 1] = initial_permutation[poz_1:poz_2 + 1][::-1]
 
     return mutation_result
 
 
+# Inversion Mutation of a tour, which also returns the change of the tour length
+# only the 2 edges at the ends of the reversed segment change (a 2-opt move), so the difference is
+# computed from 4 cities in O(1) - valid for symmetric cost matrices (contiguity_matrix[a][b] = contiguity_matrix[b][a])
+def inversion_mutation_delta(initial_permutation, contiguity_matrix):
+    permutation_size = len(initial_permutation)
+
+    # generates the positions for the inversion
+    poz_1 = np.random.randint(0, permutation_size - 1)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    mutation_result = initial_permutation.copy()
+    mutation_result[poz_1:poz_2 + 1] = initial_permutation[poz_1:poz_2 + 1][::-1]
+
+    delta = __inversion_delta__(np.asarray(initial_permutation)[None, :], contiguity_matrix,
+                                np.array([poz_1]), np.array([poz_2]))[0]
+
+    return mutation_result, delta
+
+
 # Swap Mutation - swaps 2 random values of the permutation
 
 # Example:
@@ -128,12 +219,109 @@ def insertion_mutation(initial_permutation):
     # generates the positions for the swap
     poz_1 = np.random.randint(0, permutation_size - 1)
     poz_2 = np.random.randint(poz_1 + 1, permutation_size)
-    print(poz_1, poz_2)
 
     mutation_result = initial_permutation.copy()
     mutation_result[poz_1 + 1] = initial_permutation[poz_2]
 
-    for i in range(poz_2 - poz_1 - 1):
-        mutation_result[poz_1 + i + 2] = initial_permutation[poz_1 + i + 1]
+    # the elements between the 2 positions are shifted with one position to the right
+    mutation_result[poz_1 + 2:poz_2 + 1] = initial_permutation[poz_1 + 1:poz_2]
+
+    return mutation_result
+
+
+# The following operators mutate a whole population of permutations (pop_size, n) at once
+# selected - optional boolean array of size pop_size, the individuals which are mutated (all, if missing)
+# out - as above, the population can be mutated in place
+# the positions of all the selected individuals are generated together, as in the one permutation operators
+# they return the mutated population
+
+# Swap Mutation on a population
+def swap_mutation_population(population, selected=None, out=None):
+    mutation_result, rows, poz_1, poz_2 = __permutation_population_helper__(population, selected, out)
+
+    # both values are read before writing, so the swap also works in place
+    first, second = mutation_result[rows, poz_1], mutation_result[rows, poz_2]
+    mutation_result[rows, poz_1] = second
+    mutation_result[rows, poz_2] = first
 
     return mutation_result
+
+
+# Inversion Mutation on a population
+def inversion_mutation_population(population, selected=None, out=None):
+    mutation_result, rows, poz_1, poz_2 = __permutation_population_helper__(population, selected, out)
+    __reverse_segments__(mutation_result, rows, poz_1, poz_2)
+
+    return mutation_result
+
+
+# Inversion Mutation on a population of tours, which also returns the change of every tour length
+# (0 for the individuals which are not selected) - see inversion_mutation_delta
+def inversion_mutation_population_delta(population, contiguity_matrix, selected=None, out=None):
+    mutation_result, rows, poz_1, poz_2 = __permutation_population_helper__(population, selected, out)
+
+    # the delta is computed from the tours before the inversion
+    delta = np.zeros(len(mutation_result), dtype=float)
+    delta[rows] = __inversion_delta__(mutation_result[rows], contiguity_matrix, poz_1, poz_2)
+    __reverse_segments__(mutation_result, rows, poz_1, poz_2)
+
+    return mutation_result, delta
+
+
+# on each line, position j of the segment takes the element from position poz_1 + poz_2 - j
+# (the selected lines are read before they are written)
+def __reverse_segments__(mutation_result, rows, poz_1, poz_2):
+    positions = np.arange(mutation_result.shape[1])
+    in_segment = (positions >= poz_1[:, None]) & (positions <= poz_2[:, None])
+    source = np.where(in_segment, (poz_1 + poz_2)[:, None] - positions, positions)
+    mutation_result[rows] = mutation_result[rows[:, None], source]
+
+
+# the change of the tour lengths when the segments poz_1...poz_2 of the tours are reversed:
+# the edges (before, first) and (last, after) are replaced by (before, last) and (first, after)
+def __inversion_delta__(tours, contiguity_matrix, poz_1, poz_2):
+    contiguity_matrix = np.asarray(contiguity_matrix)
+    lines = np.arange(len(tours))
+    no_of_cities = tours.shape[1]
+
+    before = tours[lines, (poz_1 - 1) % no_of_cities]
+    first = tours[lines, poz_1]
+    last = tours[lines, poz_2]
+    after = tours[lines, (poz_2 + 1) % no_of_cities]
+
+    delta = (contiguity_matrix[before, last] + contiguity_matrix[first, after]
+             - contiguity_matrix[before, first] - contiguity_matrix[last, after])
+
+    # reversing the whole tour keeps the same edges
+    delta[(poz_1 == 0) & (poz_2 == no_of_cities - 1)] = 0
+
+    return delta
+
+
+# Insertion Mutation on a population
+def insertion_mutation_population(population, selected=None, out=None):
+    mutation_result, rows, poz_1, poz_2 = __permutation_population_helper__(population, selected, out)
+
+    # on each line, the element from poz_2 goes to poz_1 + 1 and the segment poz_1 + 1...poz_2 - 1 is shifted right
+    positions = np.arange(mutation_result.shape[1])
+    shifted = (positions > poz_1[:, None] + 1) & (positions <= poz_2[:, None])
+    source = np.where(shifted, positions - 1, positions)
+    source[np.arange(len(rows)), poz_1 + 1] = poz_2
+    mutation_result[rows] = mutation_result[rows[:, None], source]
+
+    return mutation_result
+
+
+# the result array (see __mutation_result__) and the positions poz_1 < poz_2 for every selected individual
+def __permutation_population_helper__(population, selected, out):
+    mutation_result = __mutation_result__(population, out)
+    pop_size, permutation_size = mutation_result.shape
+    if selected is None:
+        rows = np.arange(pop_size)
+    else:
+        rows = np.flatnonzero(selected)
+
+    poz_1 = np.random.randint(0, permutation_size - 1, len(rows))
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    return mutation_result, rows, poz_1, poz_2
@@ -1,5 +1,6 @@
 import numpy as np
-from FunctiiMutatieIndivizi import m_uniforma, m_neuniforma
+from KnapsackFunctions import uniform_mutation_tracked, non_uniform_mutation_tracked, repair_real_tracked
+from RepairFunctions import ratio_order
 import matplotlib.pyplot as grafic
 
 # checks the feasibility of the chosen x and computes the objective function f
@@ -14,6 +15,44 @@ def ok(x,n,c,v,max):
     return cost<=max,val
 
 
+# checks the feasibility and computes the objective function for all the individuals at once
+# I: x - the population as a matrix dimxn, without the values
+# O: the feasibility mask and the array of values
+#
+#verifica fezabilitatea si calculeaza f. obiectiv pentru toti indivizii odata
+#I: x - populatia ca matrice dimxn, fara valori
+#E: vectorul fezabilitatii si vectorul valorilor
+def ok_populatie(x,c,v,max):
+    val=x@v
+    cost=x@c
+    return cost<=max,val
+
+
+# generates dim feasible individuals at once, without rejection:
+# the candidates are sampled in [0,1]^n and each candidate whose cost exceeds max is scaled down to cost max
+# lhs - if True, the candidates are sampled by latin hypercube: on every item, each of the dim intervals
+#       [k/dim, (k+1)/dim) receives exactly one candidate, so the population covers [0,1] evenly
+# O: x - the population as a matrix dimxn with elements from [0,1]
+#
+#genereaza dim indivizi fezabili odata, fara respingere:
+#candidatii sunt generati in [0,1]^n si fiecare candidat cu costul peste max este scalat pana la costul max
+#lhs - daca este True, candidatii sunt generati prin hipercub latin: pe fiecare obiect, fiecare dintre cele dim
+#      intervale [k/dim, (k+1)/dim) primeste exact un candidat, deci populatia acopera uniform [0,1]
+#E: x - populatia ca matrice dimxn cu elemente din [0,1]
+def populatie_fezabila(dim,n,c,max,lhs=False):
+    if lhs:
+        intervale=np.argsort(np.random.uniform(0,1,(dim,n)),axis=0)
+        x=(intervale+np.random.uniform(0,1,(dim,n)))/dim
+    else:
+        x=np.random.uniform(0,1,(dim,n))
+    cost=x@c
+    #the factor is slightly below max/cost, so that the rounded cost stays <= max
+    #
+    #factorul este putin sub max/cost, pentru ca si costul rotunjit sa ramana <= max
+    factor=np.minimum(1,(1-1e-12)*max/np.maximum(cost,np.finfo(float).tiny))
+    return x*factor[:,None]
+
+
 # generates the initial population
 # I: fc, fv - the names of the files cost, value
 #    max - the maximum capacity
@@ -40,31 +79,18 @@ def gen(fc,fv,max,dim):
     # works with the population as the list of dim elements - lists with n+1 individuals
     #
     #lucreaza cu populatia ca lista de dim elemente - liste cu cate n+1 indivizi
-    pop=[]
-    vectv=[]
-    for i in range(dim):
-        gata=False
-        while gata == False:
-            # generate the candidate x with elements on [0, 1]
-            #
-            #genereaza candidatul x cu elemente pe [0,1]
-            x=np.random.uniform(0,1,n)
-            gata,val=ok(x,n,c,v,max)
-        # we have found a feasible candidate solution, of type ndarray (array) x
-        # x is transformed in a list
-        #
-        #am gasit o solutie candidat fezabila, in data de tip ndarray (vector) x
-        # x este transformat in lista
-        x=list(x)
-        # add the value
-        #
-        # adauga valoarea
-        x=x+[val]
-        vectv=vectv+[val]
-        # add to the population the new individual with the value of the objective function f - add another list with n + 1 elements as an element of the list pop
-        #
-        #adauga la populatie noul individ cu valoarea f. obiectiv - adauga inca o lista cu n+1 elemente ca element al listei pop
-        pop=pop+[x]
+    # generates the feasible candidates x with elements from [0,1] - all at once, without rejection
+    #
+    #genereaza candidatii fezabili x cu elemente pe [0,1] - toti odata, fara respingere
+    x=populatie_fezabila(dim,n,c,max)
+    fez,val=ok_populatie(x,c,v,max)
+    # add to the population each individual with the objective function value
+    # - a list of n+1 elements as an element of the list pop
+    #
+    #adauga la populatie fiecare individ cu valoarea f. obiectiv
+    #- o lista cu n+1 elemente ca element al listei pop
+    pop=[list(x[i])+[val[i]] for i in range(dim)]
+    vectv=list(val)
     ind=[i for i in range(dim)]
     grafic.plot(ind,vectv,"gs",markersize=12)
     return pop, dim, n, c, v, max
@@ -72,52 +98,65 @@ def gen(fc,fv,max,dim):
 
 # mutation on the children's population
 # I:   pop,dim,n - population of dimension dimx(n+1)
+#      c, v, max - the data of the problem, as returned by gen
 #      pm - the mutation probability
 #      sigma - the fluaj step to the non-uniform mutation
+#      ordine - optional, the order of the items by value/cost ratio (ratio_order) - computed here
+#               if missing; it can be computed once and passed to every call
 # O: - mpop - mutated population
 #
 #mutatie asupra populatiei de copii
 # I:pop,dim,n - populatia de dimensiuni dimx(n+1)
+#   c, v, max - datele problemei, asa cum sunt returnate de gen
 #   pm - probabilitatea de mutatie
 #   sigma - pasul de fluaj la mutatia neuniforma
+#   ordine - optional, ordinea obiectelor dupa raportul valoare/cost (ratio_order) -
+#            calculata aici daca lipseste; se poate calcula o singura data si transmite la fiecare apel
 #E: - mpop - populatia mutata
-def mutatie_populatie(pop,dim,n,c,v,max,pm,sigma):
+def mutatie_populatie(pop,dim,n,c,v,max,pm,sigma,ordine=None):
+    # the order of the items by value/cost ratio, used by the repair - computed if it is not given
+    #
+    # ordinea obiectelor dupa raportul valoare/cost, folosita la reparare - calculata daca nu este data
+    if ordine is None:
+        ordine=ratio_order(c,v)
     # we copy the current population in the result mpop
     #
     # copiem populatia curenta in rezultatul mpop
     mpop=pop.copy()
-    valv=[]
-    for i in range(dim):
-        # we copy in x the individual i
-        #
-        #copiem in x individul i
-        x=pop[i][:n].copy()
-        for j in range(n):
-            # randomly generates if the mutation in the individual i, gene j is being made
-            #
-            #genereaza aleator daca se face mutatie in individul i gena j
-            r=np.random.uniform(0,1)
-            if r<=pm:
-                #uniform mutation
-                #
-                #mutatie uniforma
-                #x[j]=m_uniforma(0,1)
-                # non-uniform mutation
-                #
-                #mutatie neuniforma
-                x[j]=m_neuniforma(x[j],sigma,0,1)
+    valv=[pop[i][n] for i in range(dim)]
+    mx=np.array([pop[i][:n] for i in range(dim)],dtype=float)
+    # the running totals of the individuals: the value is the last element of every individual,
+    # the cost is computed once; then only the mutated and the repaired genes update them
+    #
+    # totalurile curente ale indivizilor: valoarea este ultimul element al fiecarui individ,
+    # costul este calculat o singura data; apoi doar genele mutate si reparate le actualizeaza
+    val=np.array(valv,dtype=float)
+    cost=mx@c
+    # mutation on all the genes of all the individuals - every gene is mutated with probability pm
+    #
+    #mutatie pe toate genele tuturor indivizilor - fiecare gena sufera mutatie cu probabilitatea pm
+    #uniform mutation
+    #
+    #mutatie uniforma
+    #mutat=uniform_mutation_tracked(mx,cost,val,c,v,pm,0,1)
+    # non-uniform mutation
+    #
+    #mutatie neuniforma
+    mutat=non_uniform_mutation_tracked(mx,cost,val,c,v,pm,sigma,0,1)
+    # the infeasible individuals are repaired instead of being discarded, by reducing the genes
+    # with the smallest value/cost ratio until they fit in the knapsack - only they are read again
+    #
+    # indivizii nefezabili sunt reparati in loc sa fie eliminati, prin reducerea genelor
+    # cu cel mai mic raport valoare/cost pana cand incap in rucsac - doar ei sunt parcursi din nou
+    repair_real_tracked(mx,cost,val,c,v,max,ordine)
+    for i in np.nonzero(mutat)[0]:
         # the resulted individual can possibly suffer multiple mutations
-        # if it is feasible, it is kept
+        # after the repair it is always feasible, so it is kept
         #
         #individul rezultat sufera posibil mai multe mutatii
-        #daca este fezabil, este pastrat
-        fez, val = ok(x, n, c, v, max)
-        if fez:
-            x=x+[val]
-            mpop[i]=x.copy()
-            valv=valv+[val]
-        else:
-            valv=valv+[pop[i][n]]
+        #dupa reparare este intotdeauna fezabil, deci este pastrat
+        mpop[i]=mx[i].tolist()+[val[i]]
+        valv[i]=val[i]
     ind=[i for i in range(dim)]
     grafic.plot(ind,valv,"rs",markersize=9)
     return mpop
@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as grafic
-from FunctiiCrossoverIndivizi import crossover_OCX
+from FunctiiCrossoverIndivizi import order_crossover_population
 
 
 #f. obiectiv
@@ -13,14 +13,39 @@ def foNR(x,n):
     # I: x - individul (permutarea) evaluat(a), n-dimensiunea problemei
     # E: c - calitate (numarul de perechi de regine care nu se ataca
 
+    # two queens attack each other if they are on the same diagonal i+x[i] or i-x[i]
+    # k queens on the same diagonal form k(k-1)/2 attacking pairs
+    #
+    # doua regine se ataca daca sunt pe aceeasi diagonala i+x[i] sau i-x[i]
+    # k regine pe aceeasi diagonala formeaza k(k-1)/2 perechi care se ataca
+    x=np.asarray(x[:n],dtype=int)
+    i=np.arange(n)
+    d1=np.bincount(i+x,minlength=2*n-1)
+    d2=np.bincount(i-x+n-1,minlength=2*n-1)
     c = n*(n-1)/2
-    for i in range(n):
-        for j in range(i+1,n):
-            if abs(i-j)==abs(x[i]-x[j]):
-                c=c-1
+    c=c-(d1*(d1-1)).sum()/2-(d2*(d2-1)).sum()/2
     return c
 
 
+# the objective function for all the individuals of the population pop, dimxn, at once
+# O: the array of qualities
+#
+# functia obiectiv pentru toti indivizii populatiei pop, dimxn, odata
+# E: vectorul calitatilor
+def foNR_populatie(pop,n):
+    pop=np.asarray(pop)[:,:n].astype(int)
+    dim=len(pop)
+    i=np.arange(n)
+    # the diagonals of every individual are numbered separately: individual k uses k*(2n-1)...(k+1)*(2n-1)-1
+    #
+    # diagonalele fiecarui individ sunt numerotate separat: individul k foloseste k*(2n-1)...(k+1)*(2n-1)-1
+    deplasare=(2*n-1)*np.arange(dim)[:,None]
+    d1=np.bincount((i+pop+deplasare).ravel(),minlength=dim*(2*n-1))
+    d2=np.bincount((i-pop+n-1+deplasare).ravel(),minlength=dim*(2*n-1))
+    conflicte=(d1*(d1-1)).reshape(dim,-1).sum(axis=1)/2+(d2*(d2-1)).reshape(dim,-1).sum(axis=1)/2
+    return n*(n-1)/2-conflicte
+
+
 # generates the initial population
 # I: n - the dimension of the problem
 #    dim - the number of individuals from the population
@@ -41,7 +66,10 @@ def gen(n,dim):
         #
         #genereaza candidatul permutare cu n elemente
         pop[i,:n]=np.random.permutation(n)
-        pop[i,n]=foNR(pop[i,:n],n)
+    #evaluate all the individuals at once
+    #
+    #evalueaza toti indivizii odata
+    pop[:,n]=foNR_populatie(pop,n)
     return pop
 
 
@@ -66,24 +94,19 @@ def crossover_populatie(pop,dim,n,pc):
     #the individuals from the population are selected 0,1, then 2,3 samd
     #
     #populatia este parcursa astfel incat sunt selectati indivizii 0,1 apoi 2,3 s.a.m.d
-    for i in range(0,dim-1,2):
-        #select parents
+    perechi=np.reshape(np.arange(dim-dim%2),(-1,2))
+    #for every pair randomly generate if the crossover is being made - a single call
+    #
+    #pentru fiecare pereche genereaza aleator daca se face crossover - un singur apel
+    r=np.random.uniform(0,1,len(perechi))
+    perechi=perechi[r<=pc]
+    if len(perechi):
+        #crossover on all selected pairs at once - OCX - suitable for NQueens
         #
-        #selecteaza parintii
-        x = pop[i]
-        y = pop[i+1]
-        r = np.random.uniform(0,1)
-        if r<=pc:
-            #crossover x with y - OCX -
-            #
-            # crossover x cu y - OCX - suitable for NQueens
-            c1,c2 = crossover_OCX(x,y,n)
-            val1=foNR(c1, n)
-            val2= foNR(c2, n)
-            po[i][:n]=c1.copy()
-            po[i][n]=val1
-            po[i+1][:n]=c2.copy()
-            po[i+1][n]=val2
+        #crossover pe toate perechile selectate odata - OCX - potrivit pentru NQueens
+        copii=order_crossover_population(pop[:,:n],perechi)
+        po[perechi.ravel(),:n]=copii
+        po[perechi.ravel(),n]=foNR_populatie(copii,n)
     figureaza(pop[:,n],po[:,n],dim)
     return po
 
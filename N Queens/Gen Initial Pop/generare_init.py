@@ -6,15 +6,37 @@ import matplotlib.pyplot as plt
 def compute_quality(permutation):
     # we subtract 1 from the length of the list because on the last position we find the quality
     no_of_queens = len(permutation) - 1
+    queens = np.asarray(permutation[:no_of_queens], dtype=int)
+    rows = np.arange(no_of_queens)
 
     # we assume maximum quality from the start
     quality = no_of_queens * (no_of_queens - 1) / 2
 
-    for i in range(no_of_queens - 1):
-        for j in range(i + 1, no_of_queens):
-            # for each queen that attacks each other we decrease the quality by 1
-            if abs(i - j) == abs(permutation[i] - permutation[j]):
-                quality -= 1
+    # queens attack each other if they are on the same diagonal (same i + p[i] or same i - p[i])
+    # k queens on the same diagonal form k(k-1)/2 attacking pairs, so we decrease the quality by that
+    for diagonals in (rows + queens, rows - queens + no_of_queens - 1):
+        queens_on_diagonal = np.bincount(diagonals, minlength=2 * no_of_queens - 1)
+        quality -= (queens_on_diagonal * (queens_on_diagonal - 1)).sum() / 2
+
+    return quality
+
+
+# compute the quality of all the individuals of the population at once
+# population - matrix (population_size, no_of_queens + 1), the last column is ignored
+def compute_population_quality(population):
+    queens = np.asarray(population)[:, :-1].astype(int)
+    population_size, no_of_queens = queens.shape
+    rows = np.arange(no_of_queens)
+
+    # every individual gets its own range of 2 * no_of_queens - 1 diagonals, so one bincount counts all of them
+    no_of_diagonals = 2 * no_of_queens - 1
+    offset = no_of_diagonals * np.arange(population_size)[:, None]
+
+    quality = np.full(population_size, no_of_queens * (no_of_queens - 1) / 2)
+    for diagonals in (rows + queens, rows - queens + no_of_queens - 1):
+        queens_on_diagonal = np.bincount((diagonals + offset).ravel(), minlength=population_size * no_of_diagonals)
+        attacking_pairs = queens_on_diagonal * (queens_on_diagonal - 1) / 2
+        quality -= attacking_pairs.reshape(population_size, no_of_diagonals).sum(axis=1)
 
     return quality
 
@@ -24,11 +46,11 @@ def create_individual(no_of_queens):
     # create a random permutation
     individual = np.random.permutation(no_of_queens).tolist()
 
-    # compute the quality of the individual (permutation)
-    quality = compute_quality(individual)
+    # reserve the last position for the quality, as compute_quality expects
+    individual.append(0)
 
-    # attach the quality on the last position of the individual
-    individual.append(quality)
+    # compute the quality of the individual (permutation) and attach it on the last position
+    individual[no_of_queens] = compute_quality(individual)
 
     return individual
 
@@ -58,7 +80,10 @@ def generate_initial_population(no_of_queens, population_size):
 
     for i in range(population_size):
         # generate the permutation
-        population[i] = create_individual(no_of_queens)
+        population[i, :no_of_queens] = np.random.permutation(no_of_queens)
+
+    # compute the quality of all the individuals at once
+    population[:, no_of_queens] = compute_population_quality(population)
 
     draw_population(population)
     return population
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+# ------------ N-Queens board with incremental quality ------------
+
+# A board is a list [queens, sum_diagonals, difference_diagonals, conflicts]:
+# queens - list, queens[i] = the column of the queen from row i (a permutation)
+# sum_diagonals[k] - the number of queens with i + queens[i] = k
+# difference_diagonals[k] - the number of queens with i - queens[i] + n - 1 = k
+# conflicts - the number of pairs of queens which attack each other
+# The counters are kept together with the permutation, so a move only updates the queens it touches:
+# O(1) for a swap and O(segment) for an insertion, instead of evaluating the whole board again.
+# All of them are python lists, because the moves read and write single elements.
+
+
+# creates the board of a permutation - O(n)
+def create_board(permutation):
+    queens = np.array(permutation, dtype=int)
+    no_of_queens = len(queens)
+    rows = np.arange(no_of_queens)
+
+    sum_diagonals = np.bincount(rows + queens, minlength=2 * no_of_queens - 1)
+    difference_diagonals = np.bincount(rows - queens + no_of_queens - 1, minlength=2 * no_of_queens - 1)
+
+    # k queens on the same diagonal form k(k-1)/2 attacking pairs
+    conflicts = int((sum_diagonals * (sum_diagonals - 1)).sum() // 2
+                    + (difference_diagonals * (difference_diagonals - 1)).sum() // 2)
+
+    return [queens.tolist(), sum_diagonals.tolist(), difference_diagonals.tolist(), conflicts]
+
+
+# the quality of the board - the number of pairs of queens which are not attacking each other (as foNR)
+def board_quality(board):
+    no_of_queens = len(board[0])
+    return no_of_queens * (no_of_queens - 1) / 2 - board[3]
+
+
+# ------------ Moves ------------
+
+# swaps the queens from rows poz_1 and poz_2 - O(1)
+def apply_swap(board, poz_1, poz_2):
+    queens = board[0]
+    __move_queens__(board, [poz_1, poz_2], [queens[poz_2], queens[poz_1]])
+
+
+# insertion as in insertion_mutation: the queen from poz_2 goes to poz_1 + 1 and
+# the queens from poz_1 + 1...poz_2 - 1 are shifted with one row - O(poz_2 - poz_1)
+def apply_insertion(board, poz_1, poz_2):
+    queens = board[0]
+    new_columns = [queens[poz_2]] + queens[poz_1 + 1:poz_2]
+    __move_queens__(board, range(poz_1 + 1, poz_2 + 1), new_columns)
+
+
+# the change of the quality if the queens from rows poz_1 and poz_2 are swapped - the board is not changed
+def swap_delta(board, poz_1, poz_2):
+    conflicts = board[3]
+    apply_swap(board, poz_1, poz_2)
+    delta = conflicts - board[3]
+    # a swap is undone by the same swap
+    apply_swap(board, poz_1, poz_2)
+    return delta
+
+
+# the change of the quality if the insertion (poz_1, poz_2) is applied - the board is not changed
+def insertion_delta(board, poz_1, poz_2):
+    queens = board[0]
+    conflicts = board[3]
+    old_columns = queens[poz_1 + 1:poz_2 + 1]
+    apply_insertion(board, poz_1, poz_2)
+    delta = conflicts - board[3]
+    __move_queens__(board, range(poz_1 + 1, poz_2 + 1), old_columns)
+    return delta
+
+
+# ------------ Mutations ------------
+
+# Swap Mutation on a board - the positions are generated as in swap_mutation
+# returns the change of the quality
+def swap_mutation_board(board):
+    permutation_size = len(board[0])
+    poz_1 = np.random.randint(0, permutation_size - 1)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    conflicts = board[3]
+    apply_swap(board, poz_1, poz_2)
+    return conflicts - board[3]
+
+
+# Insertion Mutation on a board - the positions are generated as in insertion_mutation
+# returns the change of the quality
+def insertion_mutation_board(board):
+    permutation_size = len(board[0])
+    poz_1 = np.random.randint(0, permutation_size - 1)
+    poz_2 = np.random.randint(poz_1 + 1, permutation_size)
+
+    conflicts = board[3]
+    apply_insertion(board, poz_1, poz_2)
+    return conflicts - board[3]
+
+
+# moves the queens from the given rows in the new columns and updates the counters and the conflicts
+def __move_queens__(board, rows, new_columns):
+    queens, sum_diagonals, difference_diagonals, conflicts = board
+    no_of_queens = len(queens)
+
+    # first all the moved queens are lifted from the board, so they are not counted against each other twice
+    for row in rows:
+        for diagonals, k in ((sum_diagonals, row + queens[row]),
+                             (difference_diagonals, row - queens[row] + no_of_queens - 1)):
+            diagonals[k] -= 1
+            conflicts -= diagonals[k]
+
+    # then they are placed in the new columns
+    for row, column in zip(rows, new_columns):
+        queens[row] = column
+        for diagonals, k in ((sum_diagonals, row + column),
+                             (difference_diagonals, row - column + no_of_queens - 1)):
+            conflicts += diagonals[k]
+            diagonals[k] += 1
+
+    board[3] = conflicts
+
+
+# Example in Python Console:
+# import numpy as np
+# import BoardFunctions as b
+# board = b.create_board(np.random.permutation(1000))
+# b.swap_delta(board, 10, 500) - the change of the quality, the board stays the same
+# b.insertion_mutation_board(board) - mutates the board and returns the change of the quality
+# b.board_quality(board)
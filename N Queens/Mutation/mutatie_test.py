@@ -1,5 +1,5 @@
 import numpy as np
-from FunctiiMutatieIndivizi import m_perm_interschimbare, m_perm_inserare
+from MutationFunctions import swap_mutation_population, insertion_mutation_population
 import matplotlib.pyplot as grafic
 
 # the objective function - for the queens problem#
@@ -11,14 +11,39 @@ import matplotlib.pyplot as grafic
 # E: c - calitate (numarul de perechi de regine care nu se ataca)
 
 def foNR(x,n):
+    # two queens attack each other if they are on the same diagonal i+x[i] or i-x[i]
+    # k queens on the same diagonal form k(k-1)/2 attacking pairs
+    #
+    # doua regine se ataca daca sunt pe aceeasi diagonala i+x[i] sau i-x[i]
+    # k regine pe aceeasi diagonala formeaza k(k-1)/2 perechi care se ataca
+    x=np.asarray(x[:n],dtype=int)
+    i=np.arange(n)
+    d1=np.bincount(i+x,minlength=2*n-1)
+    d2=np.bincount(i-x+n-1,minlength=2*n-1)
     c = n*(n-1)/2
-    for i in range(n):
-        for j in range(i+1,n):
-            if abs(i-j)==abs(x[i]-x[j]):
-                c=c-1
+    c=c-(d1*(d1-1)).sum()/2-(d2*(d2-1)).sum()/2
     return c
 
 
+# the objective function for all the individuals of the population pop, dimxn, at once
+# O: the array of qualities
+#
+# functia obiectiv pentru toti indivizii populatiei pop, dimxn, odata
+# E: vectorul calitatilor
+def foNR_populatie(pop,n):
+    pop=np.asarray(pop)[:,:n].astype(int)
+    dim=len(pop)
+    i=np.arange(n)
+    # the diagonals of every individual are numbered separately: individual k uses k*(2n-1)...(k+1)*(2n-1)-1
+    #
+    # diagonalele fiecarui individ sunt numerotate separat: individul k foloseste k*(2n-1)...(k+1)*(2n-1)-1
+    deplasare=(2*n-1)*np.arange(dim)[:,None]
+    d1=np.bincount((i+pop+deplasare).ravel(),minlength=dim*(2*n-1))
+    d2=np.bincount((i-pop+n-1+deplasare).ravel(),minlength=dim*(2*n-1))
+    conflicte=(d1*(d1-1)).reshape(dim,-1).sum(axis=1)/2+(d2*(d2-1)).reshape(dim,-1).sum(axis=1)/2
+    return n*(n-1)/2-conflicte
+
+
 # generates the initial population
 # I: n - the dimension of the problem
 #    dim - the number of individuals from the population
@@ -39,7 +64,10 @@ def gen(n,dim):
         #
         #genereaza candidatul permutare cu n elemente
         pop[i,:n]=np.random.permutation(n)
-        pop[i,n]=foNR(pop[i,:n],n)
+    #evaluate all the individuals at once
+    #
+    #evalueaza toti indivizii odata
+    pop[:,n]=foNR_populatie(pop,n)
     ind = [i for i in range(dim)]
     grafic.plot(ind, pop[:,n], "gs", markersize=12)
     return pop
@@ -55,23 +83,21 @@ def gen(n,dim):
 #   pm - probabilitatea de mutatie
 #E: - mpop - populatia mutata
 def mutatie_populatie(pop,dim,n,pm):
+    # randomly generates which individuals are mutated - a single call
+    #
+    #genereaza aleator indivizii care sufera mutatie - un singur apel
+    r=np.random.uniform(0,1,dim)
+    mutati=r<=pm
     mpop=pop.copy()
-    for i in range(dim):
-        # randomly generates if the mutation is being made
-        #
-        #genereaza aleator daca se face mutatie
-        r=np.random.uniform(0,1)
-        if r<=pm:
-            # mutation on the individual i - through interchange
-            #
-            #mutatie in individul i - prin interschimbare
-            #x=m_perm_interschimbare(mpop[i,:n],n)
-            # mutation on the individual i - through insertion
-            #
-            #mutatie in individul i - prin inserare
-            x=m_perm_inserare(mpop[i,:n],n)
-            mpop[i,:n]=x.copy()
-            mpop[i,n]=foNR(x,n)
+    # mutation on the selected individuals - through interchange
+    #
+    #mutatie in indivizii selectati - prin interschimbare
+    #mpop[:,:n]=swap_mutation_population(pop[:,:n],mutati)
+    # mutation on the selected individuals - through insertion
+    #
+    #mutatie in indivizii selectati - prin inserare
+    mpop[:,:n]=insertion_mutation_population(pop[:,:n],mutati)
+    mpop[mutati,n]=foNR_populatie(mpop[mutati],n)
     ind = [i for i in range(dim)]
     grafic.plot(ind, mpop[:,n], "rs", markersize=9)
     return mpop
@@ -47,23 +47,28 @@ def crossover_PMX(x,y,n):
 def PMX(x,y,n,p1,p2):
     c=-np.ones(n,dtype="int")
     c[p1:p2+1]=x[p1:p2+1]
+    #pozitia fiecarei valori in y si valorile deja plasate in c
+    pozy=np.zeros(n,dtype="int")
+    pozy[y]=np.arange(n)
+    plasate=np.zeros(n,dtype="bool")
+    plasate[c[p1:p2+1]]=True
     for i in range(p1,p2+1):
         a=y[i]
-        if a not in c:
+        if not plasate[a]:
             plasat=False
             curent=i
             while not plasat:
                 b=x[curent]
-                [poz]=[k for k in range(n) if y[k]==b]
+                poz=pozy[b]
                 if c[poz]==-1:
                     c[poz]=a
+                    plasate[a]=True
                     plasat=True
                 else:
                     curent=poz
-    vn=[y[i] for i in range(n) if y[i] not in c]
-    pl=[i for i in range(n) if c[i]==-1]
-    for i in range(len(vn)):
-        c[pl[i]]=vn[i]
+    vn=y[~plasate[y]]
+    pl=np.where(c==-1)[0]
+    c[pl]=vn
     return c
 
 def crossover_populatie(lparinti,dim,n,pc,c):
@@ -1,5 +1,5 @@
 import numpy as np
-from FunctiiCrossoverIndivizi import crossover_PMX
+from FunctiiCrossoverIndivizi import partially_mapped_crossover_population
 import matplotlib.pyplot as grafic
 
 # objective function
@@ -13,6 +13,23 @@ def foTSP(p,c,n):
     return 100/val
 
 
+# the objective function for all the individuals of the population pop, dimxn, at once
+# the population is parsed in blocks of lines, so the temporary matrices have at most bloc elements
+# O: lung - the lengths of the tours, 100/lung - the qualities, as in foTSP
+#
+# f. obiectiv pentru toti indivizii populatiei pop, dimxn, odata
+# populatia este parcursa pe blocuri de linii, astfel incat matricele temporare au cel mult bloc elemente
+# E: lung - lungimile traseelor, 100/lung - calitatile, ca in foTSP
+def foTSP_populatie(pop,c,n,bloc=1<<22):
+    dim=len(pop)
+    lung=np.zeros(dim,dtype=float)
+    pas=max(1,bloc//n)
+    for k in range(0,dim,pas):
+        p=pop[k:k+pas,:n]
+        lung[k:k+pas]=c[p[:,:n-1],p[:,1:]].sum(axis=1)+c[p[:,0],p[:,n-1]]
+    return lung,100/lung
+
+
 # Initial Population
 # generate the initial population
 # I: fc - the name of the file of costs
@@ -39,16 +56,15 @@ def gen(fc,dim):
     #
     #defineste o variabila ndarray dimx(n+1) cu toate elementele 0
     pop=np.zeros((dim,n),dtype=int)
-    val=np.zeros(dim,dtype=float)
     for i in range(dim):
         #generate the permutation candidate with n elements
         #
         #genereaza candidatul permutare cu n elemente
         pop[i] = np.random.permutation(n)
-        #evaluate candidate
-        #
-        # evalueaza candidat
-        val[i] = foTSP(pop[i,:n],c,n)
+    #evaluate all candidates at once
+    #
+    # evalueaza toti candidatii odata
+    lung,val = foTSP_populatie(pop,c,n)
     # [pop, val] = the list L with the first element the population, the second element the array of values
     # as a reference, pop=L[0], val=L[1]
     #
@@ -88,35 +104,24 @@ def crossover_populatie(l,dim,n,c,pc):
     #
     #sau populatia este parcursa astfel incat sunt selectati 2 indivizi consecutivi
     #poz=range(dim) #- pentru pastrarea ordinii
-    for i in range(0,dim-1,2):
-        #select parents
-        #
-        #selecteaza parintii
-        x = pop[poz[i]]
-        y = pop[poz[i+1]]
-        r = np.random.uniform(0,1)
-        if r<=pc:
-            # crossover x with y - PMX - suitable for problems with adjacent dependence
-            #
-            # crossover x cu y - PMX - potrivit pentru probleme cu dependenta de adiacenta
-            c1,c2 = crossover_PMX(x,y,n)
-            v1=foTSP(c1,c,n)
-            v2=foTSP(c2,c,n)
-        else:
-            #asexual recombination
-            #
-            # recombinare asexuata
-            c1 = x.copy()
-            c2 = y.copy()
-            v1=valori[poz[i]]
-            v2=valori[poz[i+1]]
-        #copy the result to the offspring population
-        #
-        #copiaza rezultatul in populatia urmasilor
-        po[i] = np.copy(c1)
-        po[i+1] = np.copy(c2)
-        val[i]=v1
-        val[i+1]=v2
+    perechi=np.reshape(poz[:dim-dim%2],(-1,2))
+    #for every pair randomly generate if the crossover is being made - a single call
+    #
+    #pentru fiecare pereche genereaza aleator daca se face crossover - un singur apel
+    r=np.random.uniform(0,1,len(perechi))
+    recombinate=np.repeat(r<=pc,2)
+    #asexual recombination - the parents are copied in the offspring population
+    #
+    #recombinare asexuata - parintii sunt copiati in populatia urmasilor
+    po[:len(recombinate)]=pop[perechi.ravel()]
+    val[:len(recombinate)]=valori[perechi.ravel()]
+    # crossover on all selected pairs at once - PMX - suitable for problems with adjacent dependence
+    #
+    # crossover pe toate perechile selectate odata - PMX - potrivit pentru probleme cu dependenta de adiacenta
+    if recombinate.any():
+        copii=partially_mapped_crossover_population(pop,perechi[r<=pc])
+        po[:len(recombinate)][recombinate]=copii
+        lung,val[:len(recombinate)][recombinate]=foTSP_populatie(copii,c,n)
     valori=[valori[poz[i]] for i in range(dim)]
     figureaza(valori,val,dim)
     return [po, val]
@@ -1,5 +1,7 @@
+import os
 import matplotlib.pyplot as plt
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 
 # Compute the quality of each individual
@@ -17,6 +19,158 @@ def compute_quality(individual, contiguity_matrix):
     return 100 / val
 
 
+# Compute the tour lengths and the qualities of the whole population at once
+# the population is processed in chunks of lines, so the temporary matrices have at most chunk_size elements
+def compute_population_quality(pop, contiguity_matrix, chunk_size=1 << 22):
+    pop_size, no_of_cities = pop.shape
+    lengths = np.zeros(pop_size, dtype=float)
+    lines_per_chunk = max(1, chunk_size // no_of_cities)
+
+    for start in range(0, pop_size, lines_per_chunk):
+        chunk = pop[start:start + lines_per_chunk]
+        # the cost between every city and the next one, plus the distance between the last and first city
+        lengths[start:start + lines_per_chunk] = (contiguity_matrix[chunk[:, :-1], chunk[:, 1:]].sum(axis=1)
+                                                  + contiguity_matrix[chunk[:, 0], chunk[:, -1]])
+
+    return lengths, 100 / lengths
+
+
+# ------------ Seeded tours ------------
+
+# above this number of cities the seeded tours are built on a pool of processes
+PARALLEL_MIN_CITIES = 500
+
+
+# randomized nearest neighbour tour: starts from a random city and goes to the nearest unvisited city,
+# except that with probability randomness it goes to one of the 3 nearest unvisited cities, chosen at random
+def nearest_neighbour_tour(contiguity_matrix, random_state, randomness=0.1):
+    no_of_cities = len(contiguity_matrix)
+    tour = np.zeros(no_of_cities, dtype=int)
+    visited = np.zeros(no_of_cities, dtype=bool)
+
+    tour[0] = random_state.randint(no_of_cities)
+    visited[tour[0]] = True
+
+    for i in range(1, no_of_cities):
+        distances = np.where(visited, np.inf, contiguity_matrix[tour[i - 1]])
+        no_of_candidates = min(3, no_of_cities - i)
+        if no_of_candidates > 1 and random_state.uniform(0, 1) < randomness:
+            candidates = np.argpartition(distances, no_of_candidates - 1)[:no_of_candidates]
+            tour[i] = candidates[random_state.randint(no_of_candidates)]
+        else:
+            tour[i] = np.argmin(distances)
+        visited[tour[i]] = True
+
+    return tour
+
+
+# randomized greedy edge tour: the edges to the 10 nearest neighbours of every city are added in increasing
+# order of cost (each cost multiplied by a random factor between 1 and 1 + randomness), skipping the edges
+# which would give a city 3 neighbours or close a cycle; the resulting paths are then joined starting from a
+# random one, always continuing with the path which has an end nearest to the current last city
+def greedy_edge_tour(contiguity_matrix, random_state, randomness=0.1):
+    no_of_cities = len(contiguity_matrix)
+    if no_of_cities < 3:
+        return random_state.permutation(no_of_cities)
+
+    # candidate edges (city, one of its nearest neighbours)
+    no_of_neighbours = min(10, no_of_cities - 1)
+    costs = contiguity_matrix + np.diag(np.full(no_of_cities, np.inf))
+    neighbours = np.argpartition(costs, no_of_neighbours - 1, axis=1)[:, :no_of_neighbours]
+    cities_a = np.repeat(np.arange(no_of_cities), no_of_neighbours)
+    cities_b = neighbours.ravel()
+    edge_costs = costs[cities_a, cities_b] * (1 + randomness * random_state.uniform(0, 1, len(cities_a)))
+
+    # the neighbours of each city in the tour (-1 = none yet) and the path each city belongs to
+    links = -np.ones((no_of_cities, 2), dtype=int)
+    path_of = list(range(no_of_cities))
+
+    def find(city):
+        while path_of[city] != city:
+            path_of[city] = path_of[path_of[city]]
+            city = path_of[city]
+        return city
+
+    no_of_edges = 0
+    for k in np.argsort(edge_costs):
+        a, b = cities_a[k], cities_b[k]
+        if links[a, 1] == -1 and links[b, 1] == -1 and find(a) != find(b):
+            links[a, 0 if links[a, 0] == -1 else 1] = b
+            links[b, 0 if links[b, 0] == -1 else 1] = a
+            path_of[find(a)] = find(b)
+            no_of_edges += 1
+            if no_of_edges == no_of_cities - 1:
+                break
+
+    # walk every path from one of its ends
+    paths = []
+    walked = np.zeros(no_of_cities, dtype=bool)
+    for start in random_state.permutation(no_of_cities):
+        if walked[start] or links[start, 1] != -1:
+            continue
+        path = [start]
+        walked[start] = True
+        previous, city = -1, start
+        while True:
+            following = links[city, 0] if links[city, 0] != previous else links[city, 1]
+            if following == -1:
+                break
+            previous, city = city, following
+            path.append(city)
+            walked[city] = True
+        paths.append(path)
+
+    # join the paths - the next one is the path with the nearest end, reversed if needed
+    first_cities = np.array([path[0] for path in paths])
+    last_cities = np.array([path[-1] for path in paths])
+    joined = np.zeros(len(paths), dtype=bool)
+    tour = list(paths[0])
+    joined[0] = True
+    for _ in range(len(paths) - 1):
+        to_first = np.where(joined, np.inf, contiguity_matrix[tour[-1], first_cities])
+        to_last = np.where(joined, np.inf, contiguity_matrix[tour[-1], last_cities])
+        if to_first.min() <= to_last.min():
+            k = np.argmin(to_first)
+            tour.extend(paths[k])
+        else:
+            k = np.argmin(to_last)
+            tour.extend(reversed(paths[k]))
+        joined[k] = True
+
+    return np.array(tour)
+
+
+# the tours built by one worker; the cost matrix is sent to each worker only once, by the initializer
+def __seeded_tours_worker__(method, seeds, randomness):
+    build_tour = greedy_edge_tour if method == "greedy_edge" else nearest_neighbour_tour
+    return [build_tour(__worker_contiguity_matrix__, np.random.RandomState(seed), randomness) for seed in seeds]
+
+
+def __set_worker_contiguity_matrix__(contiguity_matrix):
+    global __worker_contiguity_matrix__
+    __worker_contiguity_matrix__ = contiguity_matrix
+
+
+# generate no_of_tours seeded tours with the given method ("nearest_neighbour" or "greedy_edge")
+# for large problems the tours are divided between max_workers processes (all the cores, if None)
+def generate_seeded_tours(contiguity_matrix, no_of_tours, method="nearest_neighbour", randomness=0.1,
+                          max_workers=None):
+    # a seed for each tour, so the result depends only on the state of np.random
+    seeds = np.random.randint(0, 2 ** 31 - 1, no_of_tours)
+
+    if len(contiguity_matrix) < PARALLEL_MIN_CITIES or no_of_tours < 2:
+        __set_worker_contiguity_matrix__(contiguity_matrix)
+        return __seeded_tours_worker__(method, seeds, randomness)
+
+    # one group of seeds for each worker
+    no_of_groups = min(no_of_tours, max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=no_of_groups, initializer=__set_worker_contiguity_matrix__,
+                             initargs=(contiguity_matrix,)) as executor:
+        results = executor.map(__seeded_tours_worker__, [method] * no_of_groups,
+                               np.array_split(seeds, no_of_groups), [randomness] * no_of_groups)
+        return [tour for tours in results for tour in tours]
+
+
 # population representation by points (individual index, quality) - to see the variability in the population
 def draw_pop_graph(qualities):
     population_size = len(qualities)
@@ -32,7 +186,10 @@ def draw_pop_graph(qualities):
 
 
 # generate initial population
-def generate_initial_population(input_file_name, pop_size):
+# seeded_fraction - the fraction of individuals built with seed_method ("nearest_neighbour" or "greedy_edge"),
+#                   the others are random permutations, to keep the diversity of the population
+def generate_initial_population(input_file_name, pop_size, seeded_fraction=0.0, seed_method="nearest_neighbour",
+                                max_workers=None):
     # read the data from the file nxn of costs
     contiguity_matrix = np.genfromtxt(input_file_name)
 
@@ -42,19 +199,25 @@ def generate_initial_population(input_file_name, pop_size):
     # define a population matrix where each line is an individual
     pop = np.zeros((pop_size, no_of_cities), dtype=int)
 
-    # remember the quality of each individual in a separate list
-    qualities = np.zeros(pop_size, dtype=float)
-
     for i in range(pop_size):
         # generate the permutation candidate with no_of_cities elements
         pop[i] = np.random.permutation(no_of_cities)
 
-        # evaluate each individual
-        qualities[i] = compute_quality(pop[i], contiguity_matrix)
+    # replace a random part of the population with the seeded tours
+    no_of_seeded = int(round(seeded_fraction * pop_size))
+    if no_of_seeded > 0:
+        seeded_positions = np.random.permutation(pop_size)[:no_of_seeded]
+        pop[seeded_positions] = generate_seeded_tours(contiguity_matrix, no_of_seeded, seed_method,
+                                                      max_workers=max_workers)
+
+    # evaluate all the individuals at once and remember the qualities in a separate list
+    lengths, qualities = compute_population_quality(pop, contiguity_matrix)
 
     draw_pop_graph(qualities)
     # returns a list out of which the first element is the population and the second one the list of qualities
     return [pop, qualities]
 
 
-[p, v] = generate_initial_population("costuri.txt", 30)
+# for testing (the guard is needed by the worker processes, which may import this file again)
+if __name__ == "__main__":
+    [p, v] = generate_initial_population("costuri.txt", 30)
@@ -1,5 +1,5 @@
 import numpy as np
-from FunctiiMutatieIndivizi import m_perm_inversiune
+from MutationFunctions import inversion_mutation_population_delta
 import matplotlib.pyplot as grafic
 
 # objective function
@@ -12,6 +12,23 @@ def foTSP(p,c,n):
     val = val+c[p[0]][p[n-1]]
     return 100/val
 
+
+# the objective function for all the individuals of the population pop, dimxn, at once
+# the population is parsed in blocks of lines, so the temporary matrices have at most bloc elements
+# O: lung - the lengths of the tours, 100/lung - the qualities, as in foTSP
+#
+# f. obiectiv pentru toti indivizii populatiei pop, dimxn, odata
+# populatia este parcursa pe blocuri de linii, astfel incat matricele temporare au cel mult bloc elemente
+# E: lung - lungimile traseelor, 100/lung - calitatile, ca in foTSP
+def foTSP_populatie(pop,c,n,bloc=1<<22):
+    dim=len(pop)
+    lung=np.zeros(dim,dtype=float)
+    pas=max(1,bloc//n)
+    for k in range(0,dim,pas):
+        p=pop[k:k+pas,:n]
+        lung[k:k+pas]=c[p[:,:n-1],p[:,1:]].sum(axis=1)+c[p[:,0],p[:,n-1]]
+    return lung,100/lung
+
 # Initial Population
 # generate the initial population
 # I: fc - the name of the file of costs
@@ -39,16 +56,15 @@ def gen(fc,dim):
     #
     #defineste o variabila ndarray dimx(n+1) cu toate elementele 0
     pop=np.zeros((dim,n),dtype=int)
-    val=np.zeros(dim,dtype=float)
     for i in range(dim):
         # generate the permutation candidate with n elements
         #
         #genereaza candidatul permutare cu n elemente
         pop[i] = np.random.permutation(n)
-        # evaluate candidate
-        #
-        # evalueaza candidat
-        val[i] = foTSP(pop[i,:n],c,n)
+    # evaluate all candidates at once
+    #
+    # evalueaza toti candidatii odata
+    lung,val = foTSP_populatie(pop,c,n)
     # [pop, val] = the list L with the first element the population, the second element the array of values
     # as a reference, pop=L[0], val=L[1]
     #
@@ -80,15 +96,21 @@ def gen(fc,dim):
 def mutatie_populatie(desc,dim,n,c,pm):
     po=desc[0]
     vo=desc[1]
-    mpo=po.copy()
     mvo=vo.copy()
-    for i in range(dim):
-        r=np.random.uniform(0,1)
-        if r<=pm:
-            x=mpo[i]
-            y=m_perm_inversiune(x,n)
-            mpo[i]=y
-            mvo[i]=foTSP(y,c,n)
+    # randomly generates which individuals are mutated - a single call
+    #
+    #genereaza aleator indivizii care sufera mutatie - un singur apel
+    r=np.random.uniform(0,1,dim)
+    mutati=r<=pm
+    # mutation through inversion on the selected individuals
+    # only 2 edges of a tour are changed, so the new lengths are computed from the differences
+    # (c is symmetric) instead of evaluating the tours again
+    #
+    #mutatie prin inversiune in indivizii selectati
+    # doar 2 muchii ale unui traseu se schimba, deci noile lungimi sunt calculate din diferente
+    # (c este simetrica) in loc sa fie evaluate din nou traseele
+    mpo,dif=inversion_mutation_population_delta(po,c,mutati)
+    mvo[mutati]=100/(100/vo[mutati]+dif[mutati])
     ind = [i for i in range(dim)]
     grafic.plot(ind, mvo, "rs", markersize=9)
     return [mpo,mvo]